@@ -7,8 +7,10 @@ Run with:
 
 from __future__ import annotations
 
+import time
+
 import streamlit as st
-from src.graph import build_graph, run_research
+from src.graph import stream_research
 from src.config import MAX_ITERATIONS
 
 
@@ -171,59 +173,52 @@ if run_button:
     progress = st.progress(0, text="Initializing research pipeline...")
 
     status_container = st.container()
+    report_preview = st.empty()
 
     with st.spinner("🔬 Research in progress..."):
         try:
-            # Build graph and run step by step for progress updates
-            app = build_graph()
-
-            initial_state = {
-                "topic": topic,
-                "blog_urls": blog_urls,
-                "sources": [],
-                "errors": [],
-                "messages": [],
-                "iteration": 0,
-                "max_iterations": max_iterations,
-                "enough_data": False,
-                "analysis": "",
-                "report": "",
-            }
-
-            # Stream events for real-time progress
-            final_state = None
+            # Stream node updates for real-time progress; the runner also
+            # merges them into the full final state, so the graph runs once
+            full_state = {}
             node_progress = {
                 "planner": 0.20,
                 "researcher": 0.50,
                 "analyzer": 0.75,
                 "writer": 0.95,
             }
+            labels = {
+                "planner": "📋 Planning research strategy...",
+                "researcher": "🔍 Collecting data from sources...",
+                "analyzer": "🔬 Analyzing collected research...",
+                "writer": "📝 Writing research report...",
+            }
 
-            for event in app.stream(initial_state, stream_mode="updates"):
-                for node_name, node_output in event.items():
-                    pct = node_progress.get(node_name, 0.5)
-                    labels = {
-                        "planner": "📋 Planning research strategy...",
-                        "researcher": "🔍 Collecting data from sources...",
-                        "analyzer": "🔬 Analyzing collected research...",
-                        "writer": "📝 Writing research report...",
-                    }
-                    progress.progress(pct, text=labels.get(node_name, f"Running {node_name}..."))
-
-                    # Show messages from nodes
-                    msgs = node_output.get("messages", [])
-                    if msgs:
-                        with status_container:
-                            for msg in msgs:
-                                st.markdown(f'<div class="status-card">{msg}</div>', unsafe_allow_html=True)
-
-                    final_state = node_output
+            # Render the report progressively while the writer generates it
+            streamed_report = []
+            last_render = [0.0]
+
+            def render_token(token: str) -> None:
+                streamed_report.append(token)
+                # Re-render at most ~10x per second to keep the websocket light
+                if time.monotonic() - last_render[0] > 0.1:
+                    report_preview.markdown("".join(streamed_report))
+                    last_render[0] = time.monotonic()
+
+            for node_name, node_output, full_state in stream_research(
+                topic, blog_urls, max_iterations=max_iterations, on_token=render_token
+            ):
+                pct = node_progress.get(node_name, 0.5)
+                progress.progress(pct, text=labels.get(node_name, f"Running {node_name}..."))
+
+                # Show messages from nodes
+                msgs = node_output.get("messages", [])
+                if msgs:
+                    with status_container:
+                        for msg in msgs:
+                            st.markdown(f'<div class="status-card">{msg}</div>', unsafe_allow_html=True)
 
             progress.progress(1.0, text="✅ Research complete!")
-
-            # Get the full final state by re-invoking (stream only gives deltas)
-            # Use the last state from streaming
-            full_state = app.invoke(initial_state)
+            report_preview.empty()
 
         except Exception as e:
             st.error(f"❌ Research pipeline failed: {e}")
@@ -0,0 +1,86 @@
+"""
+Benchmark the HTML extraction backends used by the blog scraper.
+
+Runs every installed backend over a corpus of saved HTML pages and reports
+throughput plus extraction parity against the reference `html.parser`
+backend (title match and word-level Jaccard similarity of the text).
+
+Usage:
+    python benchmarks/bench_extract.py
+    python benchmarks/bench_extract.py --corpus path/to/saved/pages --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tools.extractors import EXTRACTORS, _available  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+REFERENCE = "html.parser"
+
+
+def _jaccard(a: str, b: str) -> float:
+    wa, wb = set(a.split()), set(b.split())
+    if not wa and not wb:
+        return 1.0
+    return len(wa & wb) / len(wa | wb)
+
+
+def _load_corpus(path: str) -> list[tuple[str, str]]:
+    pages = []
+    for file in sorted(glob.glob(os.path.join(path, "*.htm*"))):
+        with open(file, encoding="utf-8", errors="replace") as f:
+            pages.append((os.path.basename(file), f.read()))
+    return pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark HTML extraction backends")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of saved .html pages")
+    parser.add_argument("--repeat", type=int, default=10, help="Passes over the corpus per backend")
+    args = parser.parse_args()
+
+    pages = _load_corpus(args.corpus)
+    if not pages:
+        print(f"No .html files found in {args.corpus}", file=sys.stderr)
+        sys.exit(1)
+    total_bytes = sum(len(html.encode("utf-8")) for _, html in pages)
+
+    reference = {name: EXTRACTORS[REFERENCE](html) for name, html in pages}
+    backends = [b for b in EXTRACTORS if _available(b)]
+
+    print(f"Corpus: {len(pages)} pages, {total_bytes / 1e6:.2f} MB, {args.repeat} passes\n")
+    print(f"{'backend':<12} {'ms/page':>9} {'pages/s':>9} {'MB/s':>8} {'title ok':>9} {'text sim':>9}")
+    print("-" * 61)
+
+    for backend in backends:
+        extract = EXTRACTORS[backend]
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            results = {name: extract(html) for name, html in pages}
+        elapsed = time.perf_counter() - start
+
+        n = len(pages) * args.repeat
+        titles_ok = sum(results[name][0] == reference[name][0] for name, _ in pages)
+        similarity = sum(_jaccard(results[name][1], reference[name][1]) for name, _ in pages) / len(pages)
+
+        print(
+            f"{backend:<12} {elapsed / n * 1000:>9.2f} {n / elapsed:>9.1f} "
+            f"{total_bytes * args.repeat / elapsed / 1e6:>8.2f} "
+            f"{titles_ok:>4}/{len(pages):<4} {similarity:>9.3f}"
+        )
+
+    missing = [b for b in EXTRACTORS if b not in backends]
+    if missing:
+        print(f"\nNot installed: {', '.join(missing)}")
+
+
+if __name__ == "__main__":
+    main()
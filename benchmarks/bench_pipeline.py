@@ -0,0 +1,258 @@
+"""
+Offline benchmark of the full research pipeline and its tools.
+
+Runs planner → researcher → analyzer → writer against deterministic local
+stand-ins (benchmarks/fakes.py): a fake chat model with configurable
+latency and token rate, a stub search backend, and a local HTTP server
+serving benchmarks/corpus/. Caches, the knowledge store and rate limits
+are disabled so every run does the same work.
+
+Reports per-node latency, end-to-end wall time, tool latency, throughput
+at N concurrent runs and peak traced memory, and compares them with a
+saved baseline.
+
+Usage:
+    python benchmarks/bench_pipeline.py
+    python benchmarks/bench_pipeline.py --runs 10 --concurrency 1,4,8
+    python benchmarks/bench_pipeline.py --save-baseline      # update the baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Offline, cache-free and unthrottled: must be set before src.config is imported
+os.environ.pop("TAVILY_API_KEY", None)
+os.environ.update({
+    "PAGE_CACHE_ENABLED": "false",
+    "SEARCH_CACHE_BACKEND": "none",
+    "LLM_CACHE_ENABLED": "false",
+    "CHECKPOINT_ENABLED": "false",
+    "KNOWLEDGE_ENABLED": "false",
+    "LLM_RPM": "0",
+    "LLM_TPM": "0",
+    "SEARCH_RPM": "0",
+    "SCRAPE_RPM": "0",
+})
+
+import src.tools.web_search as web_search_module  # noqa: E402
+from fakes import CorpusServer, FakeChatModel, stub_search  # noqa: E402
+from src.config import set_llm_factory  # noqa: E402
+from src.graph import build_graph, stream_research  # noqa: E402
+from src.tools.blog_scraper import scrape_blog  # noqa: E402
+from src.tools.web_search import web_search  # noqa: E402
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus")
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines", "pipeline.json")
+NODES = ("planner", "researcher", "analyzer", "writer")
+TOPIC = "Retrieval augmented generation for research agents"
+
+
+def _ms(values: list[float]) -> dict:
+    values = sorted(v * 1000 for v in values)
+    return {
+        "mean": round(statistics.fmean(values), 2),
+        "p50": round(values[len(values) // 2], 2),
+        "max": round(values[-1], 2),
+    }
+
+
+def _run_once(app, blog_urls: list[str]) -> tuple[float, dict[str, float]]:
+    """One pipeline run: (wall seconds, seconds per node summed over iterations)."""
+    per_node = dict.fromkeys(NODES, 0.0)
+    start = last = time.perf_counter()
+    state = {}
+    for node_name, _, state in stream_research(TOPIC, blog_urls, app=app):
+        now = time.perf_counter()
+        per_node[node_name] = per_node.get(node_name, 0.0) + now - last
+        last = now
+    if not state.get("report"):
+        raise RuntimeError("benchmark run produced no report")
+    return time.perf_counter() - start, per_node
+
+
+def _bench_tools(urls: list[str], repeat: int) -> dict:
+    scrape, search = [], []
+    for _ in range(repeat):
+        for url in urls:
+            start = time.perf_counter()
+            result = scrape_blog.invoke({"url": url})
+            scrape.append(time.perf_counter() - start)
+            if "error" in result:
+                raise RuntimeError(f"scrape failed: {result['error']}")
+        start = time.perf_counter()
+        web_search.invoke({"query": TOPIC, "max_results": 5})
+        search.append(time.perf_counter() - start)
+    return {"scrape_blog": _ms(scrape), "web_search": _ms(search)}
+
+
+def _throughput(app, blog_urls: list[str], concurrency: int, runs_per_worker: int) -> float:
+    total = concurrency * runs_per_worker
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda _: _run_once(app, blog_urls), range(total)))
+    return total / (time.perf_counter() - start)
+
+
+def run_benchmark(args) -> dict:
+    with CorpusServer(args.corpus) as server:
+        urls = server.urls()
+        if not urls:
+            raise SystemExit(f"No .html files found in {args.corpus}")
+
+        set_llm_factory(lambda **_: FakeChatModel(
+            latency=args.llm_latency,
+            tokens_per_second=args.llm_tps,
+            urls=urls[1:],
+        ))
+        web_search_module._search_duckduckgo = stub_search(args.search_latency)
+
+        app = build_graph()
+        blog_urls = urls[:1]
+        _run_once(app, blog_urls)  # warm up imports, parsers and connections
+
+        walls, nodes = [], {n: [] for n in NODES}
+        for _ in range(args.runs):
+            wall, per_node = _run_once(app, blog_urls)
+            walls.append(wall)
+            for name in NODES:
+                nodes[name].append(per_node[name])
+
+        tools = _bench_tools(urls, repeat=args.runs)
+
+        throughput = {
+            str(n): round(_throughput(app, blog_urls, n, args.runs_per_worker), 3)
+            for n in args.concurrency
+        }
+
+        tracemalloc.start()
+        _run_once(app, blog_urls)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        "settings": {
+            "runs": args.runs,
+            "llm_latency": args.llm_latency,
+            "llm_tps": args.llm_tps,
+            "search_latency": args.search_latency,
+            "pages": len(urls),
+        },
+        "nodes_ms": {name: _ms(values) for name, values in nodes.items()},
+        "wall_ms": _ms(walls),
+        "tools_ms": tools,
+        "throughput_runs_per_s": throughput,
+        "peak_memory_mb": round(peak / 1e6, 2),
+    }
+
+
+def _print_results(results: dict) -> None:
+    s = results["settings"]
+    print(
+        f"Pipeline benchmark: {s['runs']} runs, LLM {s['llm_latency'] * 1000:.0f} ms TTFT "
+        f"@ {s['llm_tps']:.0f} tok/s, search {s['search_latency'] * 1000:.0f} ms, {s['pages']} pages\n"
+    )
+    print(f"{'stage':<14} {'mean ms':>9} {'p50 ms':>9} {'max ms':>9}")
+    print("-" * 44)
+    rows = [*results["nodes_ms"].items(), ("end-to-end", results["wall_ms"]), *results["tools_ms"].items()]
+    for name, stats in rows:
+        print(f"{name:<14} {stats['mean']:>9.1f} {stats['p50']:>9.1f} {stats['max']:>9.1f}")
+    print()
+    for n, rate in results["throughput_runs_per_s"].items():
+        print(f"throughput @ {n:>2} concurrent: {rate:.2f} runs/s")
+    print(f"peak traced memory (1 run): {results['peak_memory_mb']:.2f} MB")
+
+
+def _flatten(results: dict) -> dict[str, tuple[float, bool]]:
+    """`{metric: (value, higher_is_better)}` for baseline comparison."""
+    flat = {}
+    for section in ("nodes_ms", "tools_ms"):
+        for name, stats in results[section].items():
+            flat[f"{section}.{name}.p50"] = (stats["p50"], False)
+    flat["wall_ms.p50"] = (results["wall_ms"]["p50"], False)
+    for n, rate in results["throughput_runs_per_s"].items():
+        flat[f"throughput@{n}"] = (rate, True)
+    flat["peak_memory_mb"] = (results["peak_memory_mb"], False)
+    return flat
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """Print a comparison table and return the metrics that regressed."""
+    if baseline.get("settings") != results["settings"]:
+        print("\n⚠️  Baseline was recorded with different settings; deltas are not comparable")
+
+    current, base = _flatten(results), _flatten(baseline)
+    regressions = []
+    print(f"\n{'metric':<32} {'baseline':>10} {'current':>10} {'delta':>8}")
+    print("-" * 63)
+    for name, (value, higher_is_better) in current.items():
+        if name not in base or not base[name][0]:
+            continue
+        old = base[name][0]
+        delta = (value - old) / old
+        worse = -delta if higher_is_better else delta
+        flag = ""
+        if worse > tolerance:
+            regressions.append(name)
+            flag = "  ❌"
+        print(f"{name:<32} {old:>10.2f} {value:>10.2f} {delta:>+7.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline benchmark of the research pipeline")
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="Directory of saved .html pages to serve")
+    parser.add_argument("--runs", type=int, default=5, help="Sequential runs for latency stats")
+    parser.add_argument(
+        "--concurrency",
+        type=lambda v: [int(n) for n in v.split(",") if n],
+        default=[1, 4, 8],
+        help="Comma-separated concurrent-run levels for throughput (default: 1,4,8)",
+    )
+    parser.add_argument("--runs-per-worker", type=int, default=2, help="Runs per concurrent worker")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM time to first token (s)")
+    parser.add_argument("--llm-tps", type=float, default=2000.0, help="Fake LLM tokens per second")
+    parser.add_argument("--search-latency", type=float, default=0.02, help="Stub search latency (s)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help="Write the results to --baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed regression before failing (0.25 = 25%%)")
+    parser.add_argument("--json", default=None, help="Also write the results to this file")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+    _print_results(results)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline saved to {args.baseline}")
+        return
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print(f"\n❌ {len(regressions)} metric(s) regressed more than {args.tolerance:.0%}")
+            sys.exit(1)
+        print("\n✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Deterministic offline stand-ins for the pipeline's external services:
+
+    FakeChatModel  — chat model with configurable time-to-first-token and
+                     token rate; answers each agent's prompt with canned,
+                     input-derived text (valid JSON for the planner)
+    stub_search    — web search backend returning synthetic results
+    CorpusServer   — local HTTP server serving the saved HTML corpus
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+import re
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+
+_WORD = re.compile(r"[A-Za-z][A-Za-z-]{3,}")
+
+
+def _words(text: str, n: int) -> list[str]:
+    """The first `n` distinct-ish words of `text`, cycled if it is short."""
+    words = _WORD.findall(text) or ["research"]
+    return [words[i % len(words)] for i in range(n)]
+
+
+def _paragraphs(text: str, n_words: int, heading: str) -> str:
+    words = _words(text, n_words)
+    lines = [heading, ""]
+    for i in range(0, len(words), 40):
+        lines.append(" ".join(words[i:i + 40]).capitalize() + ".")
+        lines.append("")
+    return "\n".join(lines)
+
+
+class FakeChatModel(BaseChatModel):
+    """Offline chat model whose timing mimics a hosted LLM."""
+
+    latency: float = 0.05  # seconds to first token
+    tokens_per_second: float = 2000.0
+    urls: list[str] = []  # pages the planner asks the researcher to scrape
+    report_words: int = 800
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-bench"
+
+    def _respond(self, messages: list[BaseMessage]) -> str:
+        system = messages[0].content if messages else ""
+        prompt = messages[-1].content if messages else ""
+        if "research planner" in system:
+            topic = " ".join(_words(prompt, 3))
+            return (
+                '{"sub_questions": ["What is %s?", "How is %s used?", "What are the limits of %s?"], '
+                '"search_queries": ["%s overview", "how %s is used", "limits of %s"], '
+                '"urls_to_scrape": [%s]}'
+            ) % ((topic,) * 6 + (", ".join(f'"{u}"' for u in self.urls),))
+        if "summarizer" in system:
+            return _paragraphs(prompt, 120, "Summary:")
+        if "ONE BATCH" in system:
+            return "\n".join(f"- {w} finding" for w in _words(prompt, 30))
+        if "research analyst" in system:
+            return _paragraphs(prompt, 400, "## Analysis")
+        return _paragraphs(prompt, self.report_words, "# Research Report")
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        text = self._respond(messages)
+        tokens = len(text) // 4
+        time.sleep(self.latency + tokens / self.tokens_per_second)
+        message = AIMessage(
+            content=text,
+            usage_metadata={
+                "input_tokens": sum(len(str(m.content)) // 4 for m in messages),
+                "output_tokens": tokens,
+                "total_tokens": tokens,
+            },
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        text = self._respond(messages)
+        time.sleep(self.latency)
+        pieces = re.split(r"(\s+)", text)
+        # Sleep per group of pieces; a sleep per token would measure the timer
+        for i in range(0, len(pieces), 32):
+            piece = "".join(pieces[i:i + 32])
+            time.sleep(len(piece) / 4 / self.tokens_per_second)
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=piece))
+            if run_manager:
+                run_manager.on_llm_new_token(piece, chunk=chunk)
+            yield chunk
+
+
+def stub_search(latency: float = 0.02):
+    """Return a `(query, max_results) -> results` web search backend."""
+
+    def search(query: str, max_results: int) -> list[dict]:
+        time.sleep(latency)
+        slug = re.sub(r"[^a-z0-9]+", "-", query.lower()).strip("-")
+        return [
+            {
+                "title": f"{query} — result {i + 1}",
+                "url": f"https://example.org/{slug}/{i + 1}",
+                "snippet": f"Result {i + 1} about {query}: " + " ".join(_words(query * 8, 30)),
+                "source_type": "web_search",
+            }
+            for i in range(max_results)
+        ]
+
+    return search
+
+
+class CorpusServer:
+    """Serve a directory of saved pages on a free localhost port."""
+
+    def __init__(self, directory: str):
+        handler = functools.partial(_QuietHandler, directory=directory)
+        self.directory = directory
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def urls(self) -> list[str]:
+        return [
+            f"{self.base_url}/{name}"
+            for name in sorted(os.listdir(self.directory))
+            if name.endswith((".html", ".htm"))
+        ]
+
+    def __enter__(self) -> "CorpusServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
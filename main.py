@@ -3,6 +3,8 @@ CLI entry point for the research assistant.
 
 Usage:
     python main.py --topic "Your research topic" --blogs "https://blog1.com,https://blog2.com"
+    python main.py --resume <run-id>
+    python main.py --topics-file topics.jsonl --parallel 4
 """
 
 from __future__ import annotations
@@ -10,8 +12,76 @@ from __future__ import annotations
 import argparse
 import os
 import sys
+import time
 
-from src.graph import run_research
+# Keep module-level imports light: the graph, LangChain and the HTTP stack
+# load only once arguments are parsed (see --profile-startup)
+from src.checkpoint import new_run_id
+from src.config import BATCH_PARALLELISM, CHECKPOINT_ENABLED, STARTUP_IMPORT_BUDGET_MS
+
+
+def run_batch_cli(args) -> None:
+    """`--topics-file` mode: research every topic and write one report each."""
+    from src.batch import load_topics, run_batch
+
+    try:
+        topics = load_topics(args.topics_file)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read topics file: {e}", file=sys.stderr)
+        sys.exit(1)
+    if not topics:
+        print(f"❌ No topics found in {args.topics_file}", file=sys.stderr)
+        sys.exit(1)
+
+    output_dir = args.output_dir or os.path.join("output", "batch")
+    print("=" * 60)
+    print("🔬 AGENTIC RESEARCH ASSISTANT — BATCH")
+    print("=" * 60)
+    print(f"📚 Topics:   {len(topics)} from {args.topics_file}")
+    print(f"⚙️  Parallel: {args.parallel}")
+    print(f"📁 Output:   {output_dir}")
+    print("=" * 60)
+    print()
+
+    def print_result(result) -> None:
+        if result.status == "ok":
+            print(f"  ✅ [{result.index}] {result.topic} — {result.seconds:.1f}s, {result.sources} sources", flush=True)
+        else:
+            print(f"  ❌ [{result.index}] {result.topic} — failed after {result.seconds:.1f}s: {result.error}", flush=True)
+
+    start = time.perf_counter()
+    results = run_batch(topics, output_dir, parallel=args.parallel, on_result=print_result)
+    wall = time.perf_counter() - start
+
+    failed = [r for r in results if r.status != "ok"]
+    print()
+    print("=" * 60)
+    print(f"📊 {len(results) - len(failed)}/{len(results)} topics succeeded in {wall:.1f}s "
+          f"({sum(r.seconds for r in results):.1f}s of pipeline time)")
+    for r in failed:
+        print(f"  • {r.topic}: {r.error}")
+    print(f"📝 Summary saved to: {os.path.join(output_dir, 'summary.json')}")
+    if failed:
+        sys.exit(1)
+
+
+def profile_startup_cli() -> None:
+    """`--profile-startup` mode: report import-time cost per module."""
+    from src.startup import CLI_MODULES, PIPELINE_MODULES, format_profile, profile_imports, total_ms
+
+    cli = profile_imports(CLI_MODULES)
+    print(format_profile("CLI startup (import main)", cli))
+    print()
+    print(format_profile("Pipeline modules (loaded on first use)", profile_imports(PIPELINE_MODULES)))
+
+    startup_ms = total_ms(cli)
+    if STARTUP_IMPORT_BUDGET_MS and startup_ms > STARTUP_IMPORT_BUDGET_MS:
+        print(
+            f"\n❌ CLI startup imports took {startup_ms:.0f} ms "
+            f"(budget {STARTUP_IMPORT_BUDGET_MS:.0f} ms, STARTUP_IMPORT_BUDGET_MS)",
+            file=sys.stderr,
+        )
+        sys.exit(1)
 
 
 def main():
@@ -23,13 +93,27 @@ def main():
             '  python main.py --topic "Transformer architectures"\n'
             '  python main.py --topic "LLM Agents" --blogs "https://lilianweng.github.io/posts/2023-06-23-agent/"\n'
             '  python main.py --topic "RAG techniques" --output my_report.md\n'
+            '  python main.py --topic "RAG techniques" --checkpoint\n'
+            "  python main.py --resume 3f9c2a7b1d04\n"
+            "  python main.py --topics-file topics.jsonl --parallel 4\n"
         ),
     )
-    parser.add_argument(
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument(
         "--topic", "-t",
-        required=True,
         help="The research topic to investigate",
     )
+    target.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        default=None,
+        help="Resume a checkpointed run after its last completed step",
+    )
+    target.add_argument(
+        "--topics-file",
+        default=None,
+        help="Batch mode: JSONL or CSV file of topics (with optional blog URLs), one report each",
+    )
     parser.add_argument(
         "--blogs", "-b",
         default="",
@@ -40,16 +124,85 @@ def main():
         default=None,
         help="Output file path for the report (default: output/report.md)",
     )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Print the report only once it is complete instead of as it is written",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Checkpoint every step so a failed run can be resumed (also CHECKPOINT_ENABLED=true)",
+    )
+    parser.add_argument(
+        "--parallel", "-p",
+        type=int,
+        default=BATCH_PARALLELISM,
+        help=f"Batch mode: topics researched at once (default: {BATCH_PARALLELISM})",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=None,
+        help="Batch mode: directory for reports and summary.json (default: output/batch)",
+    )
+    parser.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Print a per-node breakdown of time, LLM tokens, HTTP traffic and cache hits",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        default=None,
+        help="Append the run's spans to this JSONL file (OpenTelemetry-style)",
+    )
+
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Report import time per module for the CLI and the pipeline, then exit",
+    )
 
     args = parser.parse_args()
 
+    if args.profile_startup:
+        profile_startup_cli()
+        return
+    if not (args.topic or args.resume or args.topics_file):
+        parser.error("one of the arguments --topic/-t --resume --topics-file is required")
+
+    if args.topics_file:
+        run_batch_cli(args)
+        return
+
     # Parse blog URLs
     blog_urls = [u.strip() for u in args.blogs.split(",") if u.strip()]
 
+    from src.graph import load_run, stream_research
+    from src.metrics import export_jsonl, format_summary
+
+    topic = args.topic
+    run_id = args.resume
+    final_state = {}
+    if run_id:
+        try:
+            final_state, pending = load_run(run_id)
+        except Exception as e:
+            print(f"❌ Could not load run {run_id}: {e}", file=sys.stderr)
+            sys.exit(1)
+        if not final_state:
+            print(f"❌ No checkpoint found for run {run_id}", file=sys.stderr)
+            sys.exit(1)
+        topic = final_state.get("topic", "")
+        blog_urls = final_state.get("blog_urls", [])
+    elif args.checkpoint or CHECKPOINT_ENABLED:
+        run_id = new_run_id()
+
     print("=" * 60)
     print("🔬 AGENTIC RESEARCH ASSISTANT")
     print("=" * 60)
-    print(f"📌 Topic:  {args.topic}")
+    print(f"📌 Topic:  {topic}")
+    if run_id:
+        print(f"🆔 Run:    {run_id}")
     if blog_urls:
         print(f"📄 Blogs:  {len(blog_urls)} URL(s)")
         for url in blog_urls:
@@ -58,18 +211,50 @@ def main():
     print()
 
     # Run the research pipeline
-    print("🚀 Starting research pipeline...\n")
+    if args.resume:
+        if pending:
+            print(f"♻️  Resuming research pipeline at: {', '.join(pending)}\n")
+        else:
+            print("♻️  Run already completed — reusing its report\n")
+    else:
+        print("🚀 Starting research pipeline...\n")
 
+    # Stream the report to stdout while the writer generates it
+    streamed = []
+
+    def print_token(token: str) -> None:
+        if not streamed:
+            print()
+            print("=" * 60)
+            print("📄 RESEARCH REPORT")
+            print("=" * 60)
+        streamed.append(token)
+        print(token, end="", flush=True)
+
+    # Print progress messages as each node finishes
     try:
-        final_state = run_research(args.topic, blog_urls)
+        for node_name, node_output, final_state in stream_research(
+            topic,
+            blog_urls,
+            on_token=None if args.no_stream else print_token,
+            run_id=run_id,
+            resume=bool(args.resume),
+        ):
+            if node_name == "writer" and streamed:
+                print("\n" + "=" * 60 + "\n")
+            for msg in node_output.get("messages", []):
+                print(f"  {msg}", flush=True)
+    except KeyboardInterrupt:
+        print("\n⛔ Research interrupted", file=sys.stderr)
+        if run_id:
+            print(f"   Resume with: python main.py --resume {run_id}", file=sys.stderr)
+        sys.exit(130)
     except Exception as e:
         print(f"\n❌ Research failed: {e}", file=sys.stderr)
+        if run_id:
+            print(f"   Resume with: python main.py --resume {run_id}", file=sys.stderr)
         sys.exit(1)
 
-    # Print progress messages
-    for msg in final_state.get("messages", []):
-        print(f"  {msg}")
-
     # Print errors if any
     errors = final_state.get("errors", [])
     if errors:
@@ -94,11 +279,23 @@ def main():
     print(f"   ({len(report)} characters, {len(report.split())} words)")
     print()
 
-    # Also print to stdout
-    print("=" * 60)
-    print("📄 RESEARCH REPORT")
-    print("=" * 60)
-    print(report)
+    trace = final_state.get("trace", [])
+    if args.metrics:
+        print("=" * 60)
+        print("📊 METRICS")
+        print("=" * 60)
+        print(format_summary(trace))
+        print()
+    if args.metrics_file:
+        trace_id = export_jsonl(trace, args.metrics_file, trace_id=run_id)
+        print(f"📈 {len(trace)} spans written to {args.metrics_file} (trace {trace_id})\n")
+
+    # Also print to stdout (unless it was already streamed)
+    if not streamed:
+        print("=" * 60)
+        print("📄 RESEARCH REPORT")
+        print("=" * 60)
+        print(report)
 
 
 if __name__ == "__main__":
@@ -4,9 +4,23 @@ Analyzer agent — synthesizes collected research into structured analysis.
 
 from __future__ import annotations
 
+import math
+
 from langchain_core.messages import SystemMessage, HumanMessage
 
-from src.config import get_llm
+from src.config import (
+    ANALYZER_GROUP_SIZE,
+    ANALYZER_MAP_MIN_SOURCES,
+    ANALYZER_MAP_MIN_TOKENS,
+    ANALYZER_MAX_CONCURRENCY,
+    ANALYZER_TOKEN_BUDGET,
+    RETRIEVAL_CHUNK_WORDS,
+    RETRIEVAL_ENABLED,
+    RETRIEVAL_MIN_TOKENS,
+    RETRIEVAL_TOP_K,
+    get_llm,
+)
+from src.context import PackResult, count_tokens, pack, relevance
 from src.state import ResearchState
 
 
@@ -24,38 +38,284 @@ Produce a structured analysis using clear markdown headings. Cite sources \
 by their URL when referencing specific information.
 """
 
+ANALYZER_MAP_PROMPT = """\
+You are a research analyst reviewing ONE BATCH of sources about a topic; \
+other analysts are reviewing the remaining batches. Extract, as concise \
+markdown bullet points:
+
+- Key themes and findings (facts, statistics, expert opinions)
+- Contradictions or disagreements between these sources
+- Notes on source quality and reliability
+
+Cite sources by their URL for every finding. Do not write an introduction \
+or conclusion — your notes will be merged with the other batches.
+"""
+
+ANALYZER_REDUCE_NOTE = (
+    "The sources were reviewed in batches; below are the partial analyses. "
+    "Merge them into one comprehensive analysis, de-duplicating findings and "
+    "keeping every source URL citation."
+)
+
+
+ANALYZER_RETRIEVAL_NOTE = (
+    "The passages below were retrieved from the sources for each research "
+    "sub-question. Each is tagged with the source it came from; cite that "
+    "source's URL from the source list when using it."
+)
+
+
+def _format_source(i: int, source: dict, content: str) -> str:
+    title = source.get("title", "Untitled")
+    url = source.get("url", "N/A")
+    source_type = source.get("source_type", "unknown")
+
+    return (
+        f"\n### Source {i} [{source_type}]\n"
+        f"**Title:** {title}\n"
+        f"**URL:** {url}\n"
+        f"**Content:**\n{content}\n"
+        f"---\n"
+    )
+
+
+def _pack_blocks(
+    sources: list[dict],
+    indices: list[int],
+    contents: list[str],
+    weights: list[float],
+    totals: PackResult,
+) -> list[str]:
+    """Pack the given sources into one call's token budget and format them."""
+    packed = pack(
+        [contents[i] for i in indices],
+        ANALYZER_TOKEN_BUDGET,
+        [weights[i] for i in indices],
+    )
+    totals.packed_tokens += packed.packed_tokens
+    totals.dropped_tokens += packed.dropped_tokens
+    return [
+        _format_source(i + 1, sources[i], text)
+        for i, text in zip(indices, packed.texts)
+        if text
+    ]
+
+
+def _retrieve_evidence(
+    questions: list[str],
+    contents: list[str],
+    top_k: int,
+    budget: int,
+) -> tuple[list[tuple[str, list]], int]:
+    """
+    Retrieve the top `top_k` passages for each question, filling `budget`
+    round-robin so every question gets its best passages before any gets
+    its weaker ones. A passage is used at most once.
+    Returns `(question, chunks)` pairs and the tokens used.
+    """
+    from src.retrieval import SourceRetriever
+
+    retriever = SourceRetriever(contents, RETRIEVAL_CHUNK_WORDS)
+    ranked = [[chunk for chunk, _ in retriever.retrieve(q, top_k)] for q in questions]
+    selected: list[list] = [[] for _ in questions]
+    seen: set[int] = set()
+    used = 0
+    for rank in range(top_k):
+        for q, chunks in enumerate(ranked):
+            if rank >= len(chunks) or id(chunks[rank]) in seen:
+                continue
+            cost = count_tokens(chunks[rank].text)
+            if used + cost > budget:
+                continue
+            seen.add(id(chunks[rank]))
+            selected[q].append(chunks[rank])
+            used += cost
+    return [(q, chunks) for q, chunks in zip(questions, selected) if chunks], used
+
+
+def _format_evidence(sources: list[dict], evidence: list[tuple[str, list]]) -> str:
+    sections = []
+    cited = sorted({chunk.source for _, chunks in evidence for chunk in chunks})
+    for question, chunks in evidence:
+        passages = "".join(f"\n[Source {c.source + 1}] {c.text}\n" for c in chunks)
+        sections.append(f"\n### {question}\n{passages}")
+    listing = "".join(
+        f"- **Source {i + 1}** [{sources[i].get('source_type', 'unknown')}] "
+        f"{sources[i].get('title', 'Untitled')} — {sources[i].get('url', 'N/A')}\n"
+        for i in cited
+    )
+    return f"## Source List\n{listing}\n## Evidence by Sub-Question\n{''.join(sections)}"
+
+
+def _batch_evidence(evidence: list[tuple[str, list]]) -> list[list[tuple[str, list]]]:
+    """Split evidence, in question order, into batches of at most `ANALYZER_TOKEN_BUDGET` tokens."""
+    batches: list[list[tuple[str, list]]] = [[]]
+    size = 0
+    for question, chunks in evidence:
+        for chunk in chunks:
+            cost = count_tokens(chunk.text)
+            if size + cost > ANALYZER_TOKEN_BUDGET and batches[-1]:
+                batches.append([])
+                size = 0
+            if not batches[-1] or batches[-1][-1][0] != question:
+                batches[-1].append((question, []))
+            batches[-1][-1][1].append(chunk)
+            size += cost
+    return [batch for batch in batches if batch]
+
+
+def _map_reduce(llm, topic: str, groups: list[list[str]], n_sources: int) -> tuple[str, list[str]]:
+    """
+    Analyze groups of sources in parallel, then merge the partial analyses.
+    Returns the merged analysis and an error string per failed group.
+    """
+    partials = llm.batch(
+        [
+            [
+                SystemMessage(content=ANALYZER_MAP_PROMPT),
+                HumanMessage(content=(
+                    f"**Research Topic:** {topic}\n\n"
+                    f"## Sources (batch {n} of {len(groups)})\n{''.join(group)}"
+                )),
+            ]
+            for n, group in enumerate(groups, 1)
+        ],
+        config={"max_concurrency": ANALYZER_MAX_CONCURRENCY},
+        return_exceptions=True,
+    )
+
+    notes = []
+    errors = []
+    for n, partial in enumerate(partials, 1):
+        if isinstance(partial, Exception):
+            errors.append(f"Partial analysis failed for source batch {n}: {partial}")
+        else:
+            notes.append(f"\n### Batch {n}\n{partial.content}\n")
+    failures = [p for p in partials if isinstance(p, Exception)]
+    if not notes and failures:
+        raise failures[0]
+
+    response = llm.invoke([
+        SystemMessage(content=ANALYZER_SYSTEM_PROMPT),
+        HumanMessage(content=(
+            f"**Research Topic:** {topic}\n\n"
+            f"**Number of Sources:** {n_sources}\n\n"
+            f"{ANALYZER_REDUCE_NOTE}\n\n"
+            f"## Partial Analyses\n{''.join(notes)}\n\n"
+            f"Provide a comprehensive analysis of the above sources."
+        )),
+    ])
+    return response.content, errors
+
 
 def analyzer_node(state: ResearchState) -> dict:
     """
     Analyze all collected sources and produce a structured analysis.
+
+    When the planner produced sub-questions and the sources are larger than
+    `RETRIEVAL_MIN_TOKENS`, only the passages retrieved for each
+    sub-question (BM25 over source chunks, see src/retrieval.py) are sent.
+    This takes precedence over whole-source packing. Sources larger than
+    `ANALYZER_MAP_MIN_TOKENS` get proportionally more passages per
+    sub-question (up to `ANALYZER_MAX_CONCURRENCY` calls' worth), analyzed
+    in parallel batches of `ANALYZER_TOKEN_BUDGET` tokens and merged.
+
+    Otherwise source contents share a per-call token budget
+    (`ANALYZER_TOKEN_BUDGET`), weighted by relevance to the topic. Large
+    source sets (more than `ANALYZER_MAP_MIN_SOURCES` sources or
+    `ANALYZER_MAP_MIN_TOKENS` tokens) are analyzed in parallel batches and
+    merged, instead of in one oversized prompt.
     """
-    llm = get_llm(temperature=0.2, streaming=False)
+    llm = get_llm(temperature=0.2, streaming=False, node="analyzer")
 
     topic = state["topic"]
     sources = state.get("sources", [])
 
-    # Build source summaries for the prompt
-    source_text = ""
-    for i, source in enumerate(sources, 1):
-        title = source.get("title", "Untitled")
-        url = source.get("url", "N/A")
-        content = source.get("content", source.get("snippet", ""))
-        source_type = source.get("source_type", "unknown")
-
-        source_text += (
-            f"\n### Source {i} [{source_type}]\n"
-            f"**Title:** {title}\n"
-            f"**URL:** {url}\n"
-            f"**Content:**\n{content[:3000]}\n"
-            f"---\n"
-        )
+    contents = [s.get("content", s.get("snippet", "")) for s in sources]
+    weights = [0.5 + relevance(c, topic) for c in contents]
+    raw_tokens = sum(count_tokens(c) for c in contents)
+    totals = PackResult()
 
-    if not source_text:
+    if not sources:
         return {
             "analysis": "No sources were collected. Unable to perform analysis.",
             "messages": ["⚠️ Analysis skipped — no sources available"],
         }
 
+    questions = state.get("research_plan", {}).get("sub_questions", [])
+    if RETRIEVAL_ENABLED and questions and raw_tokens > RETRIEVAL_MIN_TOKENS:
+        # Very large source sets retrieve deeper and are analyzed in batches
+        depth = max(1, math.ceil(raw_tokens / ANALYZER_MAP_MIN_TOKENS))
+        evidence, used = _retrieve_evidence(
+            [topic, *questions],
+            contents,
+            top_k=RETRIEVAL_TOP_K * depth,
+            budget=ANALYZER_TOKEN_BUDGET * min(depth, ANALYZER_MAX_CONCURRENCY),
+        )
+        passages = sum(len(chunks) for _, chunks in evidence)
+        cited = len({chunk.source for _, chunks in evidence for chunk in chunks})
+        retrieval_note = (
+            f"🔎 Retrieval: {passages} passages from {cited} of {len(sources)} sources "
+            f"for {len(questions)} sub-questions ({used:,} of {raw_tokens:,} tokens)"
+        )
+        if used > ANALYZER_TOKEN_BUDGET:
+            groups = [[_format_evidence(sources, batch)] for batch in _batch_evidence(evidence)]
+            analysis, errors = _map_reduce(llm, topic, groups, len(sources))
+            return {
+                "analysis": analysis,
+                "errors": errors,
+                "messages": [
+                    retrieval_note,
+                    f"🔬 Analysis complete — synthesized {len(sources)} sources "
+                    f"in {len(groups)} parallel batches",
+                ],
+            }
+        if evidence:
+            response = llm.invoke([
+                SystemMessage(content=ANALYZER_SYSTEM_PROMPT),
+                HumanMessage(content=(
+                    f"**Research Topic:** {topic}\n\n"
+                    f"**Number of Sources:** {len(sources)}\n\n"
+                    f"{ANALYZER_RETRIEVAL_NOTE}\n\n"
+                    f"{_format_evidence(sources, evidence)}\n\n"
+                    f"Provide a comprehensive analysis of the above evidence."
+                )),
+            ])
+            return {
+                "analysis": response.content,
+                "messages": [
+                    retrieval_note,
+                    f"🔬 Analysis complete — synthesized {len(sources)} sources",
+                ],
+            }
+
+    if (
+        len(sources) > ANALYZER_GROUP_SIZE
+        and (len(sources) > ANALYZER_MAP_MIN_SOURCES or raw_tokens > ANALYZER_MAP_MIN_TOKENS)
+    ):
+        batches = [
+            list(range(start, min(start + ANALYZER_GROUP_SIZE, len(sources))))
+            for start in range(0, len(sources), ANALYZER_GROUP_SIZE)
+        ]
+        groups = [_pack_blocks(sources, batch, contents, weights, totals) for batch in batches]
+        groups = [group for group in groups if group]
+        # Sources with no content left pack to nothing; use the single call below
+        if groups:
+            analysis, errors = _map_reduce(llm, topic, groups, len(sources))
+            return {
+                "analysis": analysis,
+                "errors": errors,
+                "messages": [
+                    f"📦 Analyzer context: {totals.describe()}",
+                    f"🔬 Analysis complete — synthesized {len(sources)} sources "
+                    f"in {len(groups)} parallel batches",
+                ],
+            }
+
+    # Build source summaries for the prompt
+    blocks = _pack_blocks(sources, list(range(len(sources))), contents, weights, totals)
+    source_text = "".join(blocks)
+
     messages = [
         SystemMessage(content=ANALYZER_SYSTEM_PROMPT),
         HumanMessage(content=(
@@ -70,5 +330,8 @@ def analyzer_node(state: ResearchState) -> dict:
 
     return {
         "analysis": response.content,
-        "messages": [f"🔬 Analysis complete — synthesized {len(sources)} sources"],
+        "messages": [
+            f"📦 Analyzer context: {totals.describe()}",
+            f"🔬 Analysis complete — synthesized {len(sources)} sources",
+        ],
     }
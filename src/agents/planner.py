@@ -36,7 +36,7 @@ def planner_node(state: ResearchState) -> dict:
     Generate or refine a research plan based on the topic and any
     previously collected data.
     """
-    llm = get_llm(temperature=0.3, streaming=False)
+    llm = get_llm(temperature=0.3, streaming=False, node="planner")
 
     topic = state["topic"]
     blog_urls = state.get("blog_urls", [])
@@ -57,6 +57,11 @@ def planner_node(state: ResearchState) -> dict:
             f"Generate NEW, DIFFERENT search queries to fill gaps in our research. "
             f"Focus on angles not yet covered."
         )
+        gaps = state.get("coverage_gaps", [])
+        if gaps:
+            user_content += "\n\n**Sub-questions our sources do not yet answer:**\n"
+            for question in gaps:
+                user_content += f"- {question}\n"
 
     messages = [
         SystemMessage(content=PLANNER_SYSTEM_PROMPT),
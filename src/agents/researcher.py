@@ -4,18 +4,137 @@ Researcher agent — executes the research plan by searching and scraping.
 
 from __future__ import annotations
 
-from src.state import ResearchState
+from src.concurrency import run_ordered
+from src.config import (
+    KNOWLEDGE_ENABLED,
+    KNOWLEDGE_MIN_HITS,
+    KNOWLEDGE_RESULTS,
+    NEAR_DUP_ENABLED,
+    NEAR_DUP_MIN_WORDS,
+    NEAR_DUP_THRESHOLD,
+    RESEARCH_MAX_WORKERS,
+    RESEARCH_TASK_TIMEOUT,
+    SUMMARIZER_TOKEN_BUDGET,
+)
+from src.context import trim_to_tokens
+from src.state import ResearchState, merge_sources
+from src.sufficiency import evaluate_coverage
 from src.tools.web_search import web_search
 from src.tools.blog_scraper import scrape_blog
-from src.tools.summarizer import summarize_content
+from src.tools.summarizer import summarize_batch
+from src.urls import canonical_url
+
+
+def _search(query: str) -> list[dict]:
+    return web_search.invoke({"query": query, "max_results": 5})
+
+
+def _scrape(url: str) -> dict:
+    return scrape_blog.invoke({"url": url})
+
+
+def _recall(
+    search_queries: list[str],
+    urls_to_scrape: list[str],
+    known: set[str],
+) -> tuple[list[dict], list[str], list[str]]:
+    """
+    Look the plan up in the knowledge store before going to the network.
+
+    Returns the fresh stored sources to reuse, the search queries that still
+    need a web search (fewer than `KNOWLEDGE_MIN_HITS` fresh matches) and
+    the URLs that still need scraping (not stored as a scraped page, or
+    stale). A stored search-result snippet never stands in for a scrape.
+    Sources whose canonical URL is in `known` (already in the run) are
+    neither reused nor counted as matches, so a follow-up query is not
+    answered by what earlier iterations collected.
+    """
+    from src.knowledge import get_knowledge_store
+
+    store = get_knowledge_store()
+    recalled = {}
+    remaining_urls = []
+    for url in urls_to_scrape:
+        doc = store.get(canonical_url(url))
+        if doc is None or doc["source_type"] == "web_search":
+            remaining_urls.append(url)
+        else:
+            recalled.setdefault(doc["canonical_url"], doc)
+
+    remaining_queries = []
+    for query in search_queries:
+        hits = [
+            doc for doc in store.search(query, KNOWLEDGE_RESULTS + len(known))
+            if doc["canonical_url"] not in known
+        ][:KNOWLEDGE_RESULTS]
+        for doc in hits:
+            recalled.setdefault(doc["canonical_url"], doc)
+        if len(hits) < KNOWLEDGE_MIN_HITS:
+            remaining_queries.append(query)
+    return list(recalled.values()), remaining_queries, remaining_urls
+
+
+def _collapse_near_duplicates(
+    merged: list[dict],
+    n_existing: int,
+) -> tuple[list[dict], list[dict], int]:
+    """
+    Fingerprint every source and fold new near-duplicates into the earlier
+    source they copy, recording their URLs in `alternate_urls`.
+
+    Returns the surviving new sources, updated copies of earlier-iteration
+    sources that absorbed a duplicate, and the number collapsed.
+    """
+    # numpy loads on first use, not at startup
+    from src.fingerprint import NearDuplicateIndex
+
+    index = NearDuplicateIndex(threshold=NEAR_DUP_THRESHOLD)
+    for i, doc in enumerate(merged[:n_existing]):
+        if len(doc.get("content", "").split()) >= NEAR_DUP_MIN_WORDS:
+            index.add(i, doc["content"])
+
+    kept = {}      # position in `merged` -> surviving new source
+    updated = {}   # position in `merged` -> earlier source with new alternates
+    collapsed = 0
+    for pos in range(n_existing, len(merged)):
+        doc = merged[pos]
+        content = doc.get("content", "")
+        if len(content.split()) < NEAR_DUP_MIN_WORDS:
+            kept[pos] = doc
+            continue
+
+        match, signature = index.query(content)
+        if match is None:
+            index.add(pos, content, signature)
+            kept[pos] = doc
+            continue
+
+        target = kept.get(match) or updated.get(match) or dict(merged[match])
+        alternates = list(target.get("alternate_urls", []))
+        for url in (doc.get("url", ""), *doc.get("alternate_urls", [])):
+            if url and url != target.get("url") and url not in alternates:
+                alternates.append(url)
+        target["alternate_urls"] = alternates
+        if match in kept:
+            kept[match] = target
+        else:
+            updated[match] = target
+        collapsed += 1
+
+    return list(kept.values()), list(updated.values()), collapsed
 
 
 def researcher_node(state: ResearchState) -> dict:
     """
     Execute the research plan:
-    1. Run all search queries from the plan
-    2. Scrape all blog / URLs from the plan
-    3. Summarize collected content
+    1. Reuse fresh sources from the knowledge store (src/knowledge.py)
+    2. Run the search queries the store could not answer
+    3. Scrape the blog / URLs from the plan that are not stored or are stale
+    4. Summarize collected content
+
+    Searches and scrapes are fanned out over a bounded worker pool
+    (`RESEARCH_MAX_WORKERS`) and merged back in plan order; long pages are
+    then summarized as one concurrent batch.
     """
     plan = state.get("research_plan", {})
     topic = state["topic"]
@@ -24,65 +143,154 @@ def researcher_node(state: ResearchState) -> dict:
     errors = []
     messages = []
 
-    # ── 1. Web searches ──────────────────────────────────────────
+    existing_sources = state.get("sources", [])
+    already_scraped = set(state.get("scraped_urls", []))
+
+    # Skip URLs fetched in earlier iterations (or repeated within the plan)
     search_queries = plan.get("search_queries", [])
-    messages.append(f"🔍 Running {len(search_queries)} web searches...")
+    urls_to_scrape = []
+    for url in plan.get("urls_to_scrape", []):
+        key = canonical_url(url)
+        if key not in already_scraped:
+            already_scraped.add(key)
+            urls_to_scrape.append(url)
+    skipped = len(plan.get("urls_to_scrape", [])) - len(urls_to_scrape)
 
-    for query in search_queries:
-        try:
-            results = web_search.invoke({"query": query, "max_results": 5})
-            if isinstance(results, list):
-                for r in results:
-                    if "error" not in r:
-                        collected_sources.append({
-                            "url": r.get("url", ""),
-                            "title": r.get("title", ""),
-                            "content": r.get("snippet", ""),
-                            "snippet": r.get("snippet", ""),
-                            "source_type": "web_search",
-                            "word_count": len(r.get("snippet", "").split()),
-                        })
-                    else:
-                        errors.append(f"Search error for '{query}': {r['error']}")
-        except Exception as e:
-            errors.append(f"Search failed for '{query}': {e}")
+    # Reuse what earlier runs already collected; only fetch gaps and stale entries
+    recalled = []
+    if KNOWLEDGE_ENABLED:
+        planned = (len(search_queries), len(urls_to_scrape))
+        known = set(state.get("scraped_urls", [])) | {
+            s.get("canonical_url") or canonical_url(s.get("url", "")) for s in existing_sources
+        }
+        recalled, search_queries, urls_to_scrape = _recall(search_queries, urls_to_scrape, known)
+        if recalled:
+            messages.append(
+                f"📚 Knowledge store: reused {len(recalled)} stored source(s), "
+                f"skipped {planned[0] - len(search_queries)} search(es) and "
+                f"{planned[1] - len(urls_to_scrape)} scrape(s)"
+            )
 
-    # ── 2. Blog / URL scraping ───────────────────────────────────
-    urls_to_scrape = plan.get("urls_to_scrape", [])
+    messages.append(f"🔍 Running {len(search_queries)} web searches...")
     messages.append(f"📄 Scraping {len(urls_to_scrape)} URLs...")
+    if skipped:
+        messages.append(f"⏭️ Skipped {skipped} duplicate or already-fetched URL(s)")
 
-    for url in urls_to_scrape:
-        try:
-            result = scrape_blog.invoke({"url": url})
-            if isinstance(result, dict) and "error" not in result:
-                # Summarize long blog content for the research context
-                content = result.get("content", "")
-                if len(content) > 2000:
-                    summary = summarize_content.invoke({
-                        "text": content,
-                        "focus": topic,
+    # Searches and scrapes share one pool so wall time tracks the slowest call
+    tasks = [("search", q) for q in search_queries] + [("scrape", u) for u in urls_to_scrape]
+    outcomes = run_ordered(
+        lambda task: _search(task[1]) if task[0] == "search" else _scrape(task[1]),
+        tasks,
+        max_workers=RESEARCH_MAX_WORKERS,
+        timeout=RESEARCH_TASK_TIMEOUT,
+    )
+    search_outcomes = outcomes[:len(search_queries)]
+    scrape_outcomes = outcomes[len(search_queries):]
+
+    # ── 1. Web searches ──────────────────────────────────────────
+    for query, (results, exc) in zip(search_queries, search_outcomes):
+        if exc is not None:
+            errors.append(f"Search failed for '{query}': {exc}")
+            continue
+        if isinstance(results, list):
+            for r in results:
+                if "error" not in r:
+                    collected_sources.append({
+                        "url": r.get("url", ""),
+                        "title": r.get("title", ""),
+                        "content": r.get("snippet", ""),
+                        "snippet": r.get("snippet", ""),
+                        "source_type": "web_search",
+                        "word_count": len(r.get("snippet", "").split()),
                     })
-                    result["content"] = summary
-                    result["word_count"] = len(summary.split())
+                else:
+                    errors.append(f"Search error for '{query}': {r['error']}")
+
+    # ── 2. Blog / URL scraping ───────────────────────────────────
+    scraped = []
+    cache_counts = {"hit": 0, "miss": 0, "revalidated": 0}
+    for url, (result, exc) in zip(urls_to_scrape, scrape_outcomes):
+        if exc is not None:
+            errors.append(f"Scrape failed for {url}: {exc}")
+        elif isinstance(result, dict) and "error" not in result:
+            cache_status = result.pop("cache_status", None)
+            if cache_status in cache_counts:
+                cache_counts[cache_status] += 1
+            scraped.append(result)
+        elif isinstance(result, dict):
+            errors.append(f"Scrape error for {url}: {result.get('error', 'Unknown')}")
+
+    # Summarize long blog content for the research context, all at once
+    long_pages = [r for r in scraped if len(r.get("content", "")) > 2000]
+    full_text = {}  # canonical URL -> page text, for pages that were summarized
+    if long_pages:
+        summaries = summarize_batch([(r["content"], topic) for r in long_pages])
+        for result, summary in zip(long_pages, summaries):
+            if isinstance(summary, Exception):
+                # Keep (trimmed) page text rather than storing an error as content
+                errors.append(f"Summarization failed for {result['url']}: {summary}")
+                result["content"] = trim_to_tokens(result["content"], SUMMARIZER_TOKEN_BUDGET)
+            else:
+                full_text[canonical_url(result["url"])] = result["content"]
+                result["content"] = summary
+            result["word_count"] = len(result["content"].split())
+    collected_sources.extend(scraped)
+
+    for source in collected_sources:
+        source["canonical_url"] = canonical_url(source.get("url", ""))
+    if KNOWLEDGE_ENABLED and collected_sources:
+        from src.knowledge import get_knowledge_store
+
+        get_knowledge_store().add(collected_sources, full_text)
+    collected_sources.extend(recalled)
+
+    if any(cache_counts.values()):
+        messages.append(
+            f"🗄️ Page cache: {cache_counts['hit']} hits, {cache_counts['miss']} misses, "
+            f"{cache_counts['revalidated']} revalidated"
+        )
+
+    # ── 3. Deduplicate by canonical URL ──────────────────────────
+    merged = merge_sources(existing_sources, collected_sources)
+    duplicates = len(existing_sources) + len(collected_sources) - len(merged)
+    if duplicates:
+        messages.append(f"🔗 Merged {duplicates} duplicate source(s) by canonical URL")
 
-                collected_sources.append(result)
-            elif isinstance(result, dict):
-                errors.append(f"Scrape error for {url}: {result.get('error', 'Unknown')}")
-        except Exception as e:
-            errors.append(f"Scrape failed for {url}: {e}")
+    # ── 4. Collapse near-duplicate content ───────────────────────
+    n_existing = len(existing_sources)
+    if NEAR_DUP_ENABLED:
+        # Earlier sources upgraded by a canonical-URL merge must be re-emitted
+        upgraded = [
+            doc for doc, old in zip(merged[:n_existing], existing_sources) if doc is not old
+        ]
+        new_sources, absorbed, collapsed = _collapse_near_duplicates(merged, n_existing)
+        collected_sources = upgraded + absorbed + new_sources
+        if collapsed:
+            messages.append(f"🧬 Collapsed {collapsed} near-duplicate source(s)")
+        total_sources = len(merged) - collapsed
+    else:
+        total_sources = len(merged)
 
-    # ── 3. Determine if we have enough data ──────────────────────
-    total_sources = len(state.get("sources", [])) + len(collected_sources)
-    enough_data = total_sources >= 3  # at least 3 sources
+    # ── 5. Determine if we have enough data ──────────────────────
+    # Score every source collected so far against the plan's sub-questions
+    coverage = evaluate_coverage(topic, plan.get("sub_questions", []), merged)
+    enough_data = coverage.sufficient
+    if coverage.error:
+        errors.append(coverage.error)
+    messages.append(f"🧭 Coverage: {coverage.describe()}")
 
     messages.append(
-        f"✅ Collected {len(collected_sources)} new sources "
+        f"✅ Collected {total_sources - n_existing} new sources "
         f"({total_sources} total). Enough data: {enough_data}"
     )
 
     return {
         "sources": collected_sources,
+        "scraped_urls": [canonical_url(s["url"]) for s in scraped]
+        + [s["canonical_url"] for s in recalled if s["source_type"] != "web_search"],
         "enough_data": enough_data,
+        "coverage": coverage.ratio,
+        "coverage_gaps": coverage.gaps,
         "errors": errors,
         "messages": messages,
     }
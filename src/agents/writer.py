@@ -6,7 +6,8 @@ from __future__ import annotations
 
 from langchain_core.messages import SystemMessage, HumanMessage
 
-from src.config import get_llm
+from src.config import WRITER_TOKEN_BUDGET, get_llm
+from src.context import count_tokens, trim_to_tokens
 from src.state import ResearchState
 
 
@@ -36,12 +37,19 @@ def writer_node(state: ResearchState) -> dict:
     """
     Generate the final research report from the analysis.
     """
-    llm = get_llm(temperature=0.3, streaming=False)
+    # Streaming lets callers of stream_research(on_token=...) show the
+    # report while it is being generated; invoke() still returns it whole
+    llm = get_llm(temperature=0.3, streaming=True, node="writer")
 
     topic = state["topic"]
     analysis = state.get("analysis", "")
     sources = state.get("sources", [])
 
+    # Keep the prompt inside the writer's token budget
+    analysis_tokens = count_tokens(analysis)
+    analysis = trim_to_tokens(analysis, WRITER_TOKEN_BUDGET)
+    trimmed_tokens = analysis_tokens - count_tokens(analysis)
+
     # Build reference list
     references = ""
     for i, source in enumerate(sources, 1):
@@ -61,7 +69,11 @@ def writer_node(state: ResearchState) -> dict:
 
     response = llm.invoke(messages)
 
+    progress = [f"📝 Research report generated ({len(response.content)} chars)"]
+    if trimmed_tokens > 0:
+        progress.insert(0, f"📦 Writer context: analysis trimmed by {trimmed_tokens} tokens")
+
     return {
         "report": response.content,
-        "messages": [f"📝 Research report generated ({len(response.content)} chars)"],
+        "messages": progress,
     }
@@ -0,0 +1,156 @@
+"""
+Batch mode — run many topics in one process.
+
+Topics run concurrently on a thread pool and share one compiled graph plus
+the process-wide HTTP session, LLM client pool, governors and caches, so
+later topics start warm instead of paying for imports and cold
+connections again.
+
+Topics files:
+    JSONL — one object per line: {"topic": "...", "blogs": ["https://...", ...]}
+            ("blogs" may also be a comma-separated string; "blog_urls" works too)
+    CSV   — a header row with a `topic` column and an optional `blogs` column
+            (URLs separated by spaces, commas or semicolons)
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable
+
+from src.concurrency import run_ordered
+from src.graph import build_graph, stream_research
+
+_URL_SPLIT = re.compile(r"[\s,;]+")
+
+
+@dataclass
+class TopicResult:
+    """Outcome of one batch topic."""
+    index: int
+    topic: str
+    status: str  # "ok" | "failed"
+    seconds: float
+    report_path: str | None = None
+    sources: int = 0
+    errors: int = 0
+    error: str | None = None
+
+
+def _split_urls(value) -> list[str]:
+    if isinstance(value, list):
+        return [str(u).strip() for u in value if str(u).strip()]
+    return [u for u in _URL_SPLIT.split(value or "") if u]
+
+
+def load_topics(path: str) -> list[dict]:
+    """Read `[{"topic": ..., "blog_urls": [...]}, ...]` from a JSONL or CSV file."""
+    topics = []
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = []
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{path}:{line_no}: invalid JSON ({e})") from e
+
+    for row in rows:
+        topic = (row.get("topic") or "").strip()
+        if not topic:
+            continue
+        urls = row.get("blogs", row.get("blog_urls"))
+        topics.append({"topic": topic, "blog_urls": _split_urls(urls)})
+    return topics
+
+
+def _slug(text: str, max_len: int = 60) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:max_len].rstrip("-") or "topic"
+
+
+def run_batch(
+    topics: list[dict],
+    output_dir: str,
+    parallel: int = 4,
+    on_result: Callable[[TopicResult], None] | None = None,
+) -> list[TopicResult]:
+    """
+    Research every topic with at most `parallel` pipelines in flight.
+
+    Each report is written to `output_dir/NN-<topic-slug>.md` and a
+    `summary.json` with per-topic timings and failures is written last.
+    `on_result` is called as each topic finishes (from a worker thread).
+    Results are returned in input order.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    app = build_graph()  # compiled once, shared by every topic
+    width = len(str(len(topics)))
+
+    def run_one(item: tuple[int, dict]) -> TopicResult:
+        index, spec = item
+        topic = spec["topic"]
+        start = time.perf_counter()
+        state = {}
+        try:
+            for _, _, state in stream_research(topic, spec.get("blog_urls"), app=app):
+                pass
+            report = state.get("report", "")
+            if not report:
+                raise RuntimeError("no report was generated")
+            path = os.path.join(output_dir, f"{index:0{width}d}-{_slug(topic)}.md")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(report)
+            result = TopicResult(
+                index=index,
+                topic=topic,
+                status="ok",
+                seconds=time.perf_counter() - start,
+                report_path=path,
+                sources=len(state.get("sources", [])),
+                errors=len(state.get("errors", [])),
+            )
+        except Exception as e:
+            result = TopicResult(
+                index=index,
+                topic=topic,
+                status="failed",
+                seconds=time.perf_counter() - start,
+                sources=len(state.get("sources", [])),
+                errors=len(state.get("errors", [])),
+                error=str(e) or type(e).__name__,
+            )
+        if on_result:
+            on_result(result)
+        return result
+
+    start = time.perf_counter()
+    outcomes = run_ordered(run_one, list(enumerate(topics, 1)), max_workers=parallel)
+    results = [result for result, _ in outcomes]
+    write_summary(results, output_dir, time.perf_counter() - start, parallel)
+    return results
+
+
+def write_summary(results: list[TopicResult], output_dir: str, wall_seconds: float, parallel: int) -> str:
+    """Write `summary.json` for a batch and return its path."""
+    summary = {
+        "topics": len(results),
+        "succeeded": sum(r.status == "ok" for r in results),
+        "failed": sum(r.status != "ok" for r in results),
+        "parallel": parallel,
+        "wall_seconds": round(wall_seconds, 2),
+        "topic_seconds": round(sum(r.seconds for r in results), 2),
+        "results": [{**asdict(r), "seconds": round(r.seconds, 2)} for r in results],
+    }
+    path = os.path.join(output_dir, "summary.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    return path
@@ -0,0 +1,147 @@
+"""
+Key/value cache stores used by the tool and LLM caches.
+
+`SqliteCache` stores values zlib-compressed in a single SQLite table and
+evicts in least-recently-used order once the table grows past its byte
+budget. `MemoryCache` offers the same interface in-process, bounded by
+entry count.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+
+class MemoryCache:
+    """A thread-safe in-process LRU store with the `SqliteCache` interface."""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._data: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+
+    def get(self, key: str) -> tuple[bytes, float] | None:
+        """Return `(value, created_at)` for `key`, or None if absent."""
+        with self._lock:
+            found = self._data.get(key)
+            if found is not None:
+                self._data.move_to_end(key)
+            return found
+
+    def set(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._data[key] = (value, time.time())
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def touch(self, key: str) -> None:
+        with self._lock:
+            if key in self._data:
+                self._data[key] = (self._data[key][0], time.time())
+                self._data.move_to_end(key)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+class SqliteCache:
+    """
+    A thread-safe, size-bounded LRU store backed by a SQLite file.
+
+    Each entry keeps its creation time so callers can apply their own
+    freshness policy (TTL, HTTP revalidation, ...).
+    """
+
+    def __init__(self, path: str, table: str = "cache", max_bytes: int = 256 * 1024 * 1024):
+        self.path = path
+        self.table = table
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_accessed ON {table} (accessed_at)"
+            )
+
+    def get(self, key: str) -> tuple[bytes, float] | None:
+        """Return `(value, created_at)` for `key`, or None if absent."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (time.time(), key)
+            )
+        return zlib.decompress(row[0]), row[1]
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store `value` under `key`, evicting old entries if over budget."""
+        blob = zlib.compress(value)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} "
+                "(key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                (key, blob, len(blob), now, now),
+            )
+            self._evict()
+
+    def touch(self, key: str) -> None:
+        """Mark `key` as freshly validated without rewriting its value."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE {self.table} SET created_at = ?, accessed_at = ? WHERE key = ?",
+                (now, now, key),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def _evict(self) -> None:
+        """Drop least-recently-used rows until the table fits `max_bytes`."""
+        total = self._conn.execute(f"SELECT COALESCE(SUM(size), 0) FROM {self.table}").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            f"SELECT key, size FROM {self.table} ORDER BY accessed_at ASC"
+        ).fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        self._conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", stale)
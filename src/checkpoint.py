@@ -0,0 +1,50 @@
+"""
+Durable run checkpoints — a SQLite-backed LangGraph checkpointer keyed by
+run id, so a failed or interrupted run resumes after its last completed
+node instead of redoing the searches, scrapes and LLM calls before it.
+
+Requires the optional `langgraph-checkpoint-sqlite` package
+(`pip install -e ".[checkpoint]"`).
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import uuid
+
+from src.config import CHECKPOINT_PATH
+
+_checkpointer = None
+_checkpointer_lock = threading.Lock()
+
+
+def new_run_id() -> str:
+    """Return a fresh, short run id."""
+    return uuid.uuid4().hex[:12]
+
+
+def get_checkpointer(path: str = CHECKPOINT_PATH):
+    """Return the process-wide SQLite checkpointer, creating it on first use."""
+    global _checkpointer
+    if _checkpointer is None:
+        with _checkpointer_lock:
+            if _checkpointer is None:
+                try:
+                    from langgraph.checkpoint.sqlite import SqliteSaver
+                except ImportError as e:
+                    raise ImportError(
+                        "Checkpointing needs langgraph-checkpoint-sqlite: "
+                        'pip install -e ".[checkpoint]"'
+                    ) from e
+
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                # Graph steps may run on worker threads; SqliteSaver serializes
+                # access with its own lock
+                conn = sqlite3.connect(path, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                _checkpointer = SqliteSaver(conn)
+    return _checkpointer
@@ -0,0 +1,79 @@
+"""
+Bounded-concurrency helpers shared by the agents and tools.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, TypeVar
+
+T = TypeVar("T")
+
+
+def run_ordered(
+    fn: Callable[[T], Any],
+    items: Iterable[T],
+    max_workers: int,
+    timeout: float | None = None,
+) -> list[tuple[Any, BaseException | None]]:
+    """
+    Run `fn` over `items` with at most `max_workers` calls in flight.
+
+    Results come back in input order as `(result, error)` pairs, so callers
+    can merge them deterministically regardless of completion order. A task
+    still running `timeout` seconds after it started yields a
+    `TimeoutError`; it is abandoned rather than killed (its slot goes to the
+    next task), so the wrapped calls should carry their own network
+    timeouts as well.
+
+    Without a `timeout`, `max_workers <= 1` or a single item runs inline on
+    the current thread; with one, calls always run on worker threads so the
+    deadline can be enforced. Worker calls run in a copy of the caller's
+    context, so context variables (e.g. the metrics collector) carry over.
+    """
+    items = list(items)
+    outcomes: list[tuple[Any, BaseException | None]] = [(None, None)] * len(items)
+
+    if timeout is None and (max_workers <= 1 or len(items) <= 1):
+        for i, item in enumerate(items):
+            try:
+                outcomes[i] = (fn(item), None)
+            except Exception as e:
+                outcomes[i] = (None, e)
+        return outcomes
+
+    slots = max(1, min(max_workers, len(items)))
+    pending = deque(range(len(items)))
+    running: dict[Future, tuple[int, float | None]] = {}  # future -> (index, deadline)
+    # Sized for every item, so abandoned calls never hold up the remaining ones
+    executor = ThreadPoolExecutor(max_workers=max(1, len(items)))
+    try:
+        while pending or running:
+            while pending and len(running) < slots:
+                i = pending.popleft()
+                future = executor.submit(contextvars.copy_context().run, fn, items[i])
+                running[future] = (i, time.monotonic() + timeout if timeout is not None else None)
+
+            deadlines = [deadline for _, deadline in running.values() if deadline is not None]
+            wait_for = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            done, _ = wait(running, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                i, _ = running.pop(future)
+                error = future.exception()
+                outcomes[i] = (None, error) if error is not None else (future.result(), None)
+
+            now = time.monotonic()
+            for future, (i, deadline) in list(running.items()):
+                if deadline is not None and now >= deadline:
+                    del running[future]
+                    future.cancel()
+                    outcomes[i] = (None, TimeoutError(f"timed out after {timeout:g}s"))
+    finally:
+        # Don't block the node on abandoned (timed-out) calls
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return outcomes
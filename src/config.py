@@ -1,12 +1,15 @@
 """
 Configuration and LLM factory for the research assistant.
+
+Only lightweight imports live here: the chat model client (src/llm.py)
+and its dependencies load on the first `get_llm()` call.
 """
 
 from __future__ import annotations
 
 import os
+
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 
 # Load .env from project root
 load_dotenv()
@@ -16,29 +19,144 @@ def get_llm(
     model: str | None = None,
     temperature: float | None = None,
     streaming: bool = True,
-) -> ChatOpenAI:
-    """
-    Return a configured ChatOpenAI instance.
-
-    Reads defaults from environment variables:
-        LLM_MODEL       (default: gpt-4o-mini)
-        LLM_TEMPERATURE (default: 0.2)
-    """
-    model = model or os.getenv("LLM_MODEL", "gpt-4o-mini")
-    temperature = (
-        temperature
-        if temperature is not None
-        else float(os.getenv("LLM_TEMPERATURE", "0.2"))
-    )
-
-    return ChatOpenAI(
-        model=model,
-        temperature=temperature,
-        streaming=streaming,
-    )
+    node: str | None = None,
+):
+    """Return a pooled, governed ChatOpenAI instance; see `src.llm.get_llm`."""
+    from src.llm import get_llm as _get_llm
+
+    return _get_llm(model=model, temperature=temperature, streaming=streaming, node=node)
+
+
+def llm_pool_stats() -> dict:
+    """Return counters for the shared LLM client pool."""
+    from src.llm import llm_pool_stats as _llm_pool_stats
+
+    return _llm_pool_stats()
+
+
+def set_llm_factory(factory) -> None:
+    """Route `get_llm()` through `factory`; see `src.llm.set_llm_factory`."""
+    from src.llm import set_llm_factory as _set_llm_factory
+
+    _set_llm_factory(factory)
 
 
 # ── Constants ────────────────────────────────────────────────────────
 MAX_SEARCH_RESULTS = int(os.getenv("MAX_SEARCH_RESULTS", "5"))
 MAX_SCRAPE_LENGTH = int(os.getenv("MAX_SCRAPE_LENGTH", "8000"))  # chars
 MAX_ITERATIONS = int(os.getenv("MAX_ITERATIONS", "2"))
+HTML_EXTRACTOR = os.getenv("HTML_EXTRACTOR", "auto")  # auto | selectolax | lxml | html.parser
+SCRAPE_MAX_BYTES = int(os.getenv("SCRAPE_MAX_BYTES", str(2 * 1024 * 1024)))  # hard cap per download
+SCRAPE_ALLOWED_TYPES = {
+    t.strip().lower()
+    for t in os.getenv("SCRAPE_ALLOWED_TYPES", "text/html,application/xhtml+xml,text/plain").split(",")
+    if t.strip()
+}
+
+# ── Researcher concurrency ───────────────────────────────────────────
+RESEARCH_MAX_WORKERS = int(os.getenv("RESEARCH_MAX_WORKERS", "4"))  # 1 = serial
+RESEARCH_TASK_TIMEOUT = float(os.getenv("RESEARCH_TASK_TIMEOUT", "60"))  # seconds
+SUMMARY_MAX_CONCURRENCY = int(os.getenv("SUMMARY_MAX_CONCURRENCY", "4"))  # parallel summaries
+
+# ── Near-duplicate detection (see src/fingerprint.py) ────────────────
+NEAR_DUP_ENABLED = os.getenv("NEAR_DUP_ENABLED", "true").lower() in ("1", "true", "yes")
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", "0.8"))  # estimated Jaccard similarity
+NEAR_DUP_MIN_WORDS = int(os.getenv("NEAR_DUP_MIN_WORDS", "20"))  # shorter texts are never collapsed
+
+# ── Shared HTTP client (scraping) ────────────────────────────────────
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "20"))  # hosts kept pooled
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "4"))  # connections per host
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "0.5"))
+
+# ── Scraped page cache ───────────────────────────────────────────────
+PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+PAGE_CACHE_PATH = os.getenv("PAGE_CACHE_PATH", os.path.join(".cache", "pages.sqlite"))
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+PAGE_CACHE_TTL = float(os.getenv("PAGE_CACHE_TTL", "3600"))  # seconds before revalidating
+
+# ── Web search cache ─────────────────────────────────────────────────
+SEARCH_CACHE_BACKEND = os.getenv("SEARCH_CACHE_BACKEND", "memory").lower()  # memory | sqlite | none
+SEARCH_CACHE_TTL = float(os.getenv("SEARCH_CACHE_TTL", "86400"))  # seconds
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", os.path.join(".cache", "search.sqlite"))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "2048"))  # memory backend
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))  # sqlite backend
+
+# ── LLM response cache (opt-in) ──────────────────────────────────────
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "false").lower() in ("1", "true", "yes")
+LLM_CACHE_NODES = {
+    n.strip()
+    for n in os.getenv("LLM_CACHE_NODES", "planner,analyzer,writer,summarizer").split(",")
+    if n.strip()
+}
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm.sqlite"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# ── Analyzer map-reduce ──────────────────────────────────────────────
+ANALYZER_MAP_MIN_SOURCES = int(os.getenv("ANALYZER_MAP_MIN_SOURCES", "12"))  # switch to map-reduce above
+ANALYZER_MAP_MIN_TOKENS = int(os.getenv("ANALYZER_MAP_MIN_TOKENS", "24000"))  # ...or above this estimate (with retrieval: scales passage depth)
+ANALYZER_GROUP_SIZE = int(os.getenv("ANALYZER_GROUP_SIZE", "6"))  # sources per map call
+ANALYZER_MAX_CONCURRENCY = int(os.getenv("ANALYZER_MAX_CONCURRENCY", "4"))
+
+# ── Cross-run knowledge store (see src/knowledge.py) ────────────────
+KNOWLEDGE_ENABLED = os.getenv("KNOWLEDGE_ENABLED", "true").lower() in ("1", "true", "yes")
+KNOWLEDGE_PATH = os.getenv("KNOWLEDGE_PATH", os.path.join(".cache", "knowledge.sqlite"))
+KNOWLEDGE_TTL = float(os.getenv("KNOWLEDGE_TTL", str(7 * 86400)))  # seconds a source stays fresh; 0 = forever
+KNOWLEDGE_MAX_BYTES = int(os.getenv("KNOWLEDGE_MAX_BYTES", str(256 * 1024 * 1024)))  # LRU eviction above
+KNOWLEDGE_RESULTS = int(os.getenv("KNOWLEDGE_RESULTS", "5"))  # stored sources reused per search query
+KNOWLEDGE_MIN_HITS = int(os.getenv("KNOWLEDGE_MIN_HITS", "3"))  # skip a web search with this many fresh hits
+KNOWLEDGE_MIN_MATCH = float(os.getenv("KNOWLEDGE_MIN_MATCH", "0.6"))  # share of query words a hit must contain
+
+# ── Research sufficiency (see src/sufficiency.py) ──────────────────
+SUFFICIENCY_EVALUATOR = os.getenv("SUFFICIENCY_EVALUATOR", "lexical").lower()  # lexical | llm
+SUFFICIENCY_THRESHOLD = float(os.getenv("SUFFICIENCY_THRESHOLD", "0.8"))  # share of sub-questions covered
+SUFFICIENCY_QUESTION_SCORE = float(os.getenv("SUFFICIENCY_QUESTION_SCORE", "0.6"))  # score that counts as covered
+SUFFICIENCY_JUDGE_TOKEN_BUDGET = int(os.getenv("SUFFICIENCY_JUDGE_TOKEN_BUDGET", "6000"))  # llm evaluator input
+
+# ── Sub-question retrieval (see src/retrieval.py) ────────────────────
+RETRIEVAL_ENABLED = os.getenv("RETRIEVAL_ENABLED", "true").lower() in ("1", "true", "yes")
+RETRIEVAL_MIN_TOKENS = int(os.getenv("RETRIEVAL_MIN_TOKENS", "3000"))  # smaller source sets are sent whole
+RETRIEVAL_CHUNK_WORDS = int(os.getenv("RETRIEVAL_CHUNK_WORDS", "120"))
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", "6"))  # passages per sub-question (scaled up for large source sets)
+
+# ── Prompt token budgets (see src/context.py) ────────────────────────
+ANALYZER_TOKEN_BUDGET = int(os.getenv("ANALYZER_TOKEN_BUDGET", "12000"))  # source tokens per analyzer call
+SUMMARIZER_TOKEN_BUDGET = int(os.getenv("SUMMARIZER_TOKEN_BUDGET", "1500"))  # input tokens per summary
+WRITER_TOKEN_BUDGET = int(os.getenv("WRITER_TOKEN_BUDGET", "8000"))  # analysis tokens given to the writer
+
+# ── Shared LLM HTTP connection pool ──────────────────────────────────
+LLM_HTTP_MAX_CONNECTIONS = int(os.getenv("LLM_HTTP_MAX_CONNECTIONS", "32"))
+LLM_HTTP_MAX_KEEPALIVE = int(os.getenv("LLM_HTTP_MAX_KEEPALIVE", "16"))
+LLM_HTTP_TIMEOUT = float(os.getenv("LLM_HTTP_TIMEOUT", "120"))  # seconds per API call
+
+# ── Rate limits and adaptive concurrency (see src/governor.py) ───────
+# Rates of 0 disable a bucket; concurrency adapts between 1 and the max
+LLM_RPM = float(os.getenv("LLM_RPM", "500"))  # requests/min
+LLM_TPM = float(os.getenv("LLM_TPM", "200000"))  # tokens/min (prompt + completion)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_LATENCY_TARGET = float(os.getenv("LLM_LATENCY_TARGET", "30"))  # seconds; slower calls shrink concurrency
+SEARCH_RPM = float(os.getenv("SEARCH_RPM", "60"))
+SEARCH_MAX_CONCURRENCY = int(os.getenv("SEARCH_MAX_CONCURRENCY", "4"))
+SEARCH_LATENCY_TARGET = float(os.getenv("SEARCH_LATENCY_TARGET", "10"))
+SCRAPE_RPM = float(os.getenv("SCRAPE_RPM", "0"))
+SCRAPE_MAX_CONCURRENCY = int(os.getenv("SCRAPE_MAX_CONCURRENCY", "16"))
+SCRAPE_LATENCY_TARGET = float(os.getenv("SCRAPE_LATENCY_TARGET", "15"))
+GOVERNOR_MAX_RETRIES = int(os.getenv("GOVERNOR_MAX_RETRIES", "4"))
+GOVERNOR_BACKOFF_BASE = float(os.getenv("GOVERNOR_BACKOFF_BASE", "1.0"))  # seconds
+GOVERNOR_BACKOFF_MAX = float(os.getenv("GOVERNOR_BACKOFF_MAX", "60"))  # seconds
+
+# ── Run checkpoints (opt-in, see src/checkpoint.py) ──────────────────
+CHECKPOINT_ENABLED = os.getenv("CHECKPOINT_ENABLED", "false").lower() in ("1", "true", "yes")
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", os.path.join(".cache", "checkpoints.sqlite"))
+
+# ── Batch mode (main.py --topics-file) ───────────────────────────────
+BATCH_PARALLELISM = int(os.getenv("BATCH_PARALLELISM", "4"))  # topics researched at once
+
+# ── Job server (python -m src.server) ────────────────────────────────
+SERVER_HOST = os.getenv("SERVER_HOST", "127.0.0.1")
+SERVER_PORT = int(os.getenv("SERVER_PORT", "8000"))
+SERVER_WORKERS = int(os.getenv("SERVER_WORKERS", "4"))  # research jobs run at once
+JOBS_DB_PATH = os.getenv("JOBS_DB_PATH", os.path.join(".cache", "jobs.sqlite"))
+
+# ── Startup profiling (main.py --profile-startup) ────────────────────
+STARTUP_IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "300"))  # 0 = no budget
@@ -0,0 +1,151 @@
+"""
+Token-budgeted context packing for LLM prompts.
+
+Instead of fixed character slices, sources share a per-call token budget:
+each gets a slice proportional to its weight, short sources give their
+unused share back to the others, and anything trimmed is cut at a sentence
+boundary.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+
+_CHARS_PER_TOKEN = 4
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD = re.compile(r"\w+")
+
+_encoder = None
+_encoder_loaded = False
+_encoder_lock = threading.Lock()
+
+
+def _get_encoder():
+    """Load a tiktoken encoder once; None when tiktoken or its data is unavailable."""
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        with _encoder_lock:
+            if not _encoder_loaded:
+                try:
+                    import tiktoken
+
+                    model = os.getenv("LLM_MODEL", "gpt-4o-mini")
+                    try:
+                        _encoder = tiktoken.encoding_for_model(model)
+                    except KeyError:
+                        _encoder = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    _encoder = None
+                _encoder_loaded = True
+    return _encoder
+
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, or estimate at ~4 characters per token."""
+    if not text:
+        return 0
+    encoder = _get_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text, disallowed_special=()))
+    return -(-len(text) // _CHARS_PER_TOKEN)
+
+
+def trim_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Trim `text` to at most `max_tokens`, cutting at the last sentence
+    boundary that fits. Falls back to a hard cut when even the first
+    sentence is over budget.
+    """
+    if max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens:
+        return text
+
+    kept = []
+    used = 0
+    pos = 0
+    for match in _SENTENCE_END.finditer(text):
+        sentence = text[pos:match.end()]
+        cost = count_tokens(sentence)
+        if used + cost > max_tokens:
+            break
+        kept.append(sentence)
+        used += cost
+        pos = match.end()
+
+    if kept:
+        return "".join(kept).rstrip()
+
+    encoder = _get_encoder()
+    if encoder is not None:
+        return encoder.decode(encoder.encode(text, disallowed_special=())[:max_tokens])
+    return text[:max_tokens * _CHARS_PER_TOKEN]
+
+
+def relevance(text: str, query: str) -> float:
+    """Fraction of the query's words that appear in `text` (0.0–1.0)."""
+    query_words = {w.lower() for w in _WORD.findall(query)}
+    if not query_words:
+        return 0.0
+    text_words = {w.lower() for w in _WORD.findall(text)}
+    return len(query_words & text_words) / len(query_words)
+
+
+def allocate(demands: list[int], budget: int, weights: list[float] | None = None) -> list[int]:
+    """
+    Split `budget` tokens across items wanting `demands` tokens each.
+
+    Shares are proportional to `weights`; an item that needs less than its
+    share keeps only what it needs and the remainder is redistributed
+    among the rest (weighted water-filling).
+    """
+    weights = weights or [1.0] * len(demands)
+    shares = [0] * len(demands)
+    open_items = {i for i, d in enumerate(demands) if d > 0}
+    remaining = budget
+
+    while open_items and remaining > 0:
+        total_weight = sum(max(weights[i], 1e-9) for i in open_items)
+        satisfied = {
+            i for i in open_items
+            if demands[i] <= remaining * max(weights[i], 1e-9) / total_weight
+        }
+        if not satisfied:
+            for i in open_items:
+                shares[i] = int(remaining * max(weights[i], 1e-9) / total_weight)
+            break
+        for i in satisfied:
+            shares[i] = demands[i]
+            remaining -= demands[i]
+        open_items -= satisfied
+
+    return shares
+
+
+@dataclass
+class PackResult:
+    """Packed texts (same order as the input) plus token accounting."""
+    texts: list[str] = field(default_factory=list)
+    packed_tokens: int = 0
+    dropped_tokens: int = 0
+
+    def describe(self) -> str:
+        return f"{self.packed_tokens} tokens packed, {self.dropped_tokens} trimmed"
+
+
+def pack(texts: list[str], budget: int, weights: list[float] | None = None) -> PackResult:
+    """Fit `texts` into `budget` tokens; see `allocate` for how shares are set."""
+    demands = [count_tokens(t) for t in texts]
+    shares = allocate(demands, budget, weights)
+
+    result = PackResult()
+    for text, demand, share in zip(texts, demands, shares):
+        packed = text if share >= demand else trim_to_tokens(text, share)
+        used = demand if packed is text else count_tokens(packed)
+        result.texts.append(packed)
+        result.packed_tokens += used
+        result.dropped_tokens += demand - used
+    return result
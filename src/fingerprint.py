@@ -0,0 +1,119 @@
+"""
+Near-duplicate detection over source contents — MinHash signatures with an
+in-memory LSH (banding) index.
+
+Signatures use one-permutation MinHash: every word shingle is hashed once
+with vectorized numpy arithmetic and binned, and each bin keeps its
+minimum. That keeps fingerprinting well under a millisecond for a scraped
+page.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+_EMPTY = np.uint64(0xFFFFFFFFFFFFFFFF)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+class MinHasher:
+    """Computes fixed-size MinHash signatures of word-shingle sets."""
+
+    def __init__(self, num_perm: int = 64, shingle_size: int = 4, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        # Odd multipliers, one per shingle position
+        self._multipliers = (
+            rng.randint(1, 1 << 62, size=shingle_size, dtype=np.int64).astype(np.uint64)
+            | np.uint64(1)
+        )
+
+    def signature(self, text: str) -> np.ndarray | None:
+        """Return the MinHash signature of `text`, or None if it has no words."""
+        words = text.lower().split()
+        if not words:
+            return None
+        # Python's str hash is stable within a process, which is all a
+        # per-run index needs
+        word_hashes = np.array([hash(w) for w in words], dtype=np.int64).view(np.uint64)
+
+        k = min(self.shingle_size, len(words))
+        n = len(words) - k + 1
+        shingles = np.zeros(n, dtype=np.uint64)
+        for j in range(k):
+            shingles ^= word_hashes[j:j + n] * self._multipliers[j]
+        shingles *= _MIX
+        shingles ^= shingles >> np.uint64(31)
+
+        bins = shingles % np.uint64(self.num_perm)
+        values = shingles // np.uint64(self.num_perm)
+        order = np.argsort(values, kind="stable")
+        first_bins, first_idx = np.unique(bins[order], return_index=True)
+
+        signature = np.full(self.num_perm, _EMPTY, dtype=np.uint64)
+        signature[first_bins.astype(np.intp)] = values[order][first_idx]
+        return signature
+
+
+def _similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity, ignoring bins empty in both signatures."""
+    used = (a != _EMPTY) | (b != _EMPTY)
+    if not used.any():
+        return 0.0
+    return float(np.mean(a[used] == b[used]))
+
+
+class NearDuplicateIndex:
+    """
+    LSH index over MinHash signatures.
+
+    Signatures are split into `bands`; documents sharing any band bucket
+    become candidates, and a candidate is a duplicate when its estimated
+    Jaccard similarity reaches `threshold`.
+    """
+
+    def __init__(self, threshold: float = 0.8, num_perm: int = 64, bands: int = 16):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm)
+        self._buckets: list[dict[bytes, list[int]]] = [{} for _ in range(bands)]
+        self._signatures: dict[int, np.ndarray] = {}
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        return [
+            signature[b * self.rows:(b + 1) * self.rows].tobytes()
+            for b in range(self.bands)
+        ]
+
+    def query(self, text: str) -> tuple[int | None, np.ndarray | None]:
+        """
+        Return `(doc_id, signature)` for the most similar indexed document at
+        or above the threshold (`doc_id` is None when there is none).
+        """
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return None, None
+
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best, best_score = None, self.threshold
+        for doc_id in sorted(candidates):
+            score = _similarity(self._signatures[doc_id], signature)
+            if score >= best_score:
+                best, best_score = doc_id, score
+        return best, signature
+
+    def add(self, doc_id: int, text: str, signature: np.ndarray | None = None) -> None:
+        if signature is None:
+            signature = self.hasher.signature(text)
+        if signature is None:
+            return
+        self._signatures[doc_id] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, []).append(doc_id)
@@ -0,0 +1,360 @@
+"""
+Adaptive rate limiting and concurrency control for external backends
+(LLM API, web search, page scraping).
+
+Each backend gets a `Governor` combining:
+    - token buckets for requests/min and (for the LLM) tokens/min,
+    - an AIMD concurrency limit that halves on 429s, shrinks when calls
+      exceed their latency target and grows back by one slot per window of
+      successful calls,
+    - jittered exponential retry that honors `Retry-After`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Iterator
+
+from src.config import (
+    GOVERNOR_BACKOFF_BASE,
+    GOVERNOR_BACKOFF_MAX,
+    GOVERNOR_MAX_RETRIES,
+    LLM_LATENCY_TARGET,
+    LLM_MAX_CONCURRENCY,
+    LLM_RPM,
+    LLM_TPM,
+    SCRAPE_LATENCY_TARGET,
+    SCRAPE_MAX_CONCURRENCY,
+    SCRAPE_RPM,
+    SEARCH_LATENCY_TARGET,
+    SEARCH_MAX_CONCURRENCY,
+    SEARCH_RPM,
+)
+
+
+class TokenBucket:
+    """
+    Classic token bucket refilled at `per_minute / 60` units per second.
+    A rate of 0 (or less) disables the limit.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._level = min(self.capacity, self._level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """Block until `amount` units are available, then take them."""
+        if self.rate <= 0 or amount <= 0:
+            return
+        # Requests larger than the bucket go through once it is full
+        needed = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._level >= needed:
+                    self._level -= amount
+                    return
+                wait = (needed - self._level) / self.rate
+            time.sleep(wait)
+
+    def charge(self, amount: float) -> None:
+        """Take `amount` units after the fact (may leave the bucket in debt)."""
+        if self.rate <= 0 or amount <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._level -= amount
+
+
+class AdaptiveConcurrency:
+    """AIMD-controlled cap on the number of calls in flight."""
+
+    def __init__(self, max_limit: int, min_limit: int = 1, latency_target: float | None = None):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.latency_target = latency_target
+        self.limit = float(self.max_limit)
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False, latency: float | None = None) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.min_limit, self.limit / 2)
+            elif latency is not None and self.latency_target and latency > self.latency_target:
+                self.limit = max(self.min_limit, self.limit * 0.9)
+            elif latency is not None:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+
+# ── Error classification ─────────────────────────────────────────────
+def _status_code(exc: BaseException) -> int | None:
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        code = getattr(getattr(exc, "response", None), "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_throttled(exc: BaseException) -> bool:
+    """True for HTTP 429s and provider-specific rate-limit exceptions."""
+    return _status_code(exc) == 429 or "ratelimit" in type(exc).__name__.lower()
+
+
+def is_transient(exc: BaseException) -> bool:
+    """True for errors worth retrying: throttling, 5xx, timeouts, dropped connections."""
+    if is_throttled(exc):
+        return True
+    code = _status_code(exc)
+    if code is not None:
+        return code >= 500
+    name = type(exc).__name__.lower()
+    return "timeout" in name or "connection" in name
+
+
+def retry_after(exc: BaseException) -> float | None:
+    """Seconds requested by a `Retry-After` header on the failed response, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not headers:
+        return None
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+class Governor:
+    """Rate limits, adaptive concurrency and retries for one backend."""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: float = 0,
+        tokens_per_minute: float = 0,
+        max_concurrency: int = 8,
+        latency_target: float | None = None,
+        max_retries: int = GOVERNOR_MAX_RETRIES,
+        retry_on: Callable[[BaseException], bool] = is_transient,
+    ):
+        self.name = name
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.concurrency = AdaptiveConcurrency(max_concurrency, latency_target=latency_target)
+        self.max_retries = max_retries
+        self.retry_on = retry_on
+        self._stats = {"calls": 0, "throttled": 0, "retries": 0, "failures": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self._stats[key] += 1
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["concurrency_limit"] = round(self.concurrency.limit, 2)
+        stats["in_flight"] = self.concurrency.in_flight
+        return stats
+
+    def acquire(self, tokens: float = 0) -> None:
+        """Wait for a concurrency slot and rate budget."""
+        self.concurrency.acquire()
+        try:
+            self.requests.acquire(1)
+            self.tokens.acquire(tokens)
+        except BaseException:
+            self.concurrency.release()
+            raise
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        delay = random.uniform(0, min(GOVERNOR_BACKOFF_MAX, GOVERNOR_BACKOFF_BASE * 2 ** attempt))
+        requested = retry_after(exc)
+        if requested is not None:
+            # Honor the server's wait, plus a little jitter to avoid a thundering herd
+            delay = min(requested, GOVERNOR_BACKOFF_MAX) + random.uniform(0, GOVERNOR_BACKOFF_BASE)
+        return delay
+
+    def _on_error(self, exc: BaseException, attempt: int) -> float | None:
+        """Release the slot; return the delay before retrying, or None to give up."""
+        throttled = is_throttled(exc)
+        self.concurrency.release(throttled=throttled)
+        if throttled:
+            self._count("throttled")
+        if attempt >= self.max_retries or not self.retry_on(exc):
+            self._count("failures")
+            return None
+        self._count("retries")
+        return self._backoff(attempt, exc)
+
+    def call(self, fn: Callable[[], Any], tokens: float = 0) -> Any:
+        """Run `fn` under this governor, retrying transient failures."""
+        self._count("calls")
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens)
+            start = time.monotonic()
+            try:
+                result = fn()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            self.concurrency.release(latency=time.monotonic() - start)
+            return result
+
+    async def acall(self, fn: Callable[[], Awaitable[Any]], tokens: float = 0) -> Any:
+        """Async variant of `call`; blocking waits run off the event loop."""
+        self._count("calls")
+        for attempt in range(self.max_retries + 1):
+            await asyncio.to_thread(self.acquire, tokens)
+            start = time.monotonic()
+            try:
+                result = await fn()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self.concurrency.release(latency=time.monotonic() - start)
+            return result
+
+    def stream(self, fn: Callable[[], Iterable[Any]], tokens: float = 0) -> Iterator[Any]:
+        """
+        Iterate a streaming call under this governor. Failures before the
+        first item are retried; the slot is held until the stream ends and
+        time-to-first-item is the latency signal.
+        """
+        self._count("calls")
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens)
+            start = time.monotonic()
+            try:
+                iterator = iter(fn())
+                first = next(iterator, _END)
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                continue
+            break
+        latency = time.monotonic() - start
+
+        released = False
+        try:
+            if first is not _END:
+                yield first
+                yield from iterator
+        except Exception as e:
+            self.concurrency.release(throttled=is_throttled(e))
+            released = True
+            raise
+        finally:
+            if not released:
+                self.concurrency.release(latency=latency)
+
+    async def astream(self, fn: Callable[[], AsyncIterator[Any]], tokens: float = 0) -> AsyncIterator[Any]:
+        """Async variant of `stream`."""
+        self._count("calls")
+        for attempt in range(self.max_retries + 1):
+            await asyncio.to_thread(self.acquire, tokens)
+            start = time.monotonic()
+            try:
+                iterator = fn().__aiter__()
+                first = await anext(iterator, _END)
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            break
+        latency = time.monotonic() - start
+
+        released = False
+        try:
+            if first is not _END:
+                yield first
+                async for item in iterator:
+                    yield item
+        except Exception as e:
+            self.concurrency.release(throttled=is_throttled(e))
+            released = True
+            raise
+        finally:
+            if not released:
+                self.concurrency.release(latency=latency)
+
+
+_END = object()
+
+_governors: dict[str, Governor] = {}
+_governors_lock = threading.Lock()
+
+_GOVERNOR_SETTINGS = {
+    "llm": dict(
+        requests_per_minute=LLM_RPM,
+        tokens_per_minute=LLM_TPM,
+        max_concurrency=LLM_MAX_CONCURRENCY,
+        latency_target=LLM_LATENCY_TARGET,
+    ),
+    "search": dict(
+        requests_per_minute=SEARCH_RPM,
+        max_concurrency=SEARCH_MAX_CONCURRENCY,
+        latency_target=SEARCH_LATENCY_TARGET,
+    ),
+    "scrape": dict(
+        requests_per_minute=SCRAPE_RPM,
+        max_concurrency=SCRAPE_MAX_CONCURRENCY,
+        latency_target=SCRAPE_LATENCY_TARGET,
+        # Connection errors and 5xx are already retried by the HTTP session
+        retry_on=is_throttled,
+    ),
+}
+
+
+def get_governor(name: str) -> Governor:
+    """Return the process-wide governor for "llm", "search" or "scrape"."""
+    governor = _governors.get(name)
+    if governor is None:
+        with _governors_lock:
+            governor = _governors.get(name)
+            if governor is None:
+                governor = Governor(name, **_GOVERNOR_SETTINGS.get(name, {}))
+                _governors[name] = governor
+    return governor
+
+
+def governor_stats() -> dict[str, dict]:
+    """Stats for every governor created so far."""
+    with _governors_lock:
+        return {name: g.stats() for name, g in _governors.items()}
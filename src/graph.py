@@ -5,10 +5,15 @@ with conditional looping for iterative research.
 
 from __future__ import annotations
 
+from typing import Annotated, Callable, Iterator, get_args, get_origin, get_type_hints
+
 from langgraph.graph import StateGraph, START, END
 
 from src.state import ResearchState
-from src.config import MAX_ITERATIONS
+from src.checkpoint import get_checkpointer
+from src.config import MAX_ITERATIONS, SUFFICIENCY_THRESHOLD
+from src.metrics import instrument_node, metrics_handler
+from src.sufficiency import resolve_evaluator
 from src.agents.planner import planner_node
 from src.agents.researcher import researcher_node
 from src.agents.analyzer import analyzer_node
@@ -18,10 +23,15 @@ from src.agents.writer import writer_node
 def _should_continue_research(state: ResearchState) -> str:
     """
     Conditional edge after the researcher node.
-    If we don't have enough data AND haven't hit the iteration limit,
-    loop back to the planner for refined queries.
+    If the sources cover less than `SUFFICIENCY_THRESHOLD` of the planned
+    sub-questions AND we haven't hit the iteration limit, loop back to the
+    planner for queries targeting the gaps.
     """
-    enough_data = state.get("enough_data", False)
+    coverage = state.get("coverage")
+    if coverage is None:  # checkpoints from before coverage was recorded
+        enough_data = state.get("enough_data", False)
+    else:
+        enough_data = coverage >= SUFFICIENCY_THRESHOLD
     iteration = state.get("iteration", 1)
     max_iter = state.get("max_iterations", MAX_ITERATIONS)
 
@@ -31,22 +41,28 @@ def _should_continue_research(state: ResearchState) -> str:
         return "planner"
 
 
-def build_graph() -> StateGraph:
+def build_graph(checkpointer=None) -> StateGraph:
     """
     Construct and compile the research assistant graph.
 
+    With a `checkpointer` (see src/checkpoint.py) the state is saved after
+    every node, keyed by the run id passed as the `thread_id`.
+
     Flow:
         START → planner → researcher →[conditional]→ analyzer → writer → END
                    ↑                       |
                    └───── (loop if not enough data)
     """
+    resolve_evaluator()  # fail before any research on a misconfigured evaluator
+
     graph = StateGraph(ResearchState)
 
     # ── Add nodes ────────────────────────────────────────────────
-    graph.add_node("planner", planner_node)
-    graph.add_node("researcher", researcher_node)
-    graph.add_node("analyzer", analyzer_node)
-    graph.add_node("writer", writer_node)
+    # Every node reports timing, token, HTTP and cache spans into `trace`
+    graph.add_node("planner", instrument_node("planner", planner_node))
+    graph.add_node("researcher", instrument_node("researcher", researcher_node))
+    graph.add_node("analyzer", instrument_node("analyzer", analyzer_node))
+    graph.add_node("writer", instrument_node("writer", writer_node))
 
     # ── Add edges ────────────────────────────────────────────────
     graph.add_edge(START, "planner")
@@ -65,34 +81,161 @@ def build_graph() -> StateGraph:
     graph.add_edge("analyzer", "writer")
     graph.add_edge("writer", END)
 
-    return graph.compile()
-
-
-def run_research(topic: str, blog_urls: list[str] | None = None) -> ResearchState:
-    """
-    High-level helper — run the full research pipeline and return final state.
-
-    Args:
-        topic: The research topic.
-        blog_urls: Optional list of blog URLs to include.
+    return graph.compile(checkpointer=checkpointer)
 
-    Returns:
-        The final ResearchState with the completed report.
-    """
-    app = build_graph()
 
-    initial_state: ResearchState = {
+def build_initial_state(
+    topic: str,
+    blog_urls: list[str] | None = None,
+    max_iterations: int | None = None,
+) -> ResearchState:
+    """Return the starting state for a research run."""
+    return {
         "topic": topic,
         "blog_urls": blog_urls or [],
         "sources": [],
+        "scraped_urls": [],
         "errors": [],
         "messages": [],
+        "trace": [],
         "iteration": 0,
-        "max_iterations": MAX_ITERATIONS,
+        "max_iterations": max_iterations or MAX_ITERATIONS,
         "enough_data": False,
+        "coverage_gaps": [],
         "analysis": "",
         "report": "",
     }
 
-    final_state = app.invoke(initial_state)
+
+def _state_reducers() -> dict:
+    """Map each `Annotated[..., reducer]` field of ResearchState to its reducer."""
+    reducers = {}
+    for key, hint in get_type_hints(ResearchState, include_extras=True).items():
+        if get_origin(hint) is Annotated:
+            reducer = get_args(hint)[-1]
+            if callable(reducer):
+                reducers[key] = reducer
+    return reducers
+
+
+_REDUCERS = _state_reducers()
+
+# Nodes whose LLM output is forwarded token-by-token to `on_token`
+TOKEN_STREAM_NODES = {"writer"}
+
+
+def apply_update(state: ResearchState, update: dict) -> ResearchState:
+    """Merge one node's output into `state` using the graph's own reducers."""
+    merged = dict(state)
+    for key, value in (update or {}).items():
+        reducer = _REDUCERS.get(key)
+        merged[key] = reducer(merged.get(key) or [], value) if reducer else value
+    return merged
+
+
+def _run_config(run_id: str | None = None) -> dict:
+    config = {"callbacks": [metrics_handler]}  # records LLM spans
+    if run_id:
+        config["configurable"] = {"thread_id": run_id}
+    return config
+
+
+def load_run(run_id: str, app=None) -> tuple[ResearchState, tuple[str, ...]]:
+    """
+    Return `(state, pending_nodes)` checkpointed for `run_id`. `state` is
+    empty for an unknown run; `pending_nodes` is empty once it finished.
+    """
+    app = app or build_graph(get_checkpointer())
+    snapshot = app.get_state(_run_config(run_id))
+    return dict(snapshot.values or {}), tuple(snapshot.next)
+
+
+def stream_research(
+    topic: str | None,
+    blog_urls: list[str] | None = None,
+    max_iterations: int | None = None,
+    app=None,
+    on_token: Callable[[str], None] | None = None,
+    run_id: str | None = None,
+    resume: bool = False,
+) -> Iterator[tuple[str, dict, ResearchState]]:
+    """
+    Run the pipeline once, yielding `(node_name, node_output, state)` after
+    every node. `state` is the merged state so far; the last one yielded is
+    the final state, so callers get progress and the report from a single
+    execution.
+
+    If `on_token` is given, report text is passed to it chunk by chunk while
+    the writer is still generating; the full report still lands in
+    `state["report"]`.
+
+    If `run_id` is given, the state is checkpointed under it after every
+    node. With `resume=True` the checkpointed run continues after its last
+    completed node (`topic`, `blog_urls` and `max_iterations` are ignored);
+    a run that already finished yields nothing.
+    """
+    if app is None:
+        app = build_graph(get_checkpointer()) if run_id else build_graph()
+    config = _run_config(run_id)
+
+    if resume:
+        if not run_id:
+            raise ValueError("resume=True requires a run_id")
+        state, pending = load_run(run_id, app)
+        if not state:
+            raise ValueError(f"No checkpoint found for run {run_id!r}")
+        if not pending:
+            return
+        graph_input = None  # continue from the checkpoint
+    else:
+        state = build_initial_state(topic, blog_urls, max_iterations)
+        graph_input = state
+
+    stream_mode = ["updates", "messages"] if on_token else ["updates"]
+    for mode, payload in app.stream(graph_input, config=config, stream_mode=stream_mode):
+        if mode == "messages":
+            message, metadata = payload
+            content = getattr(message, "content", "")
+            if metadata.get("langgraph_node") in TOKEN_STREAM_NODES and isinstance(content, str) and content:
+                on_token(content)
+            continue
+
+        for node_name, node_output in payload.items():
+            state = apply_update(state, node_output)
+            yield node_name, node_output or {}, state
+
+
+def run_research(
+    topic: str | None,
+    blog_urls: list[str] | None = None,
+    on_token: Callable[[str], None] | None = None,
+    run_id: str | None = None,
+    resume: bool = False,
+) -> ResearchState:
+    """
+    High-level helper — run the full research pipeline and return final state.
+
+    Args:
+        topic: The research topic (ignored when resuming).
+        blog_urls: Optional list of blog URLs to include.
+        on_token: Optional callback receiving report text as it is written.
+        run_id: Checkpoint the run under this id (see src/checkpoint.py).
+        resume: Continue the checkpointed run `run_id` after its last
+            completed node instead of starting over.
+
+    Returns:
+        The final ResearchState with the completed report.
+    """
+    # One compiled graph for both the checkpoint lookup and the run
+    app = build_graph(get_checkpointer()) if run_id else build_graph()
+    if resume:
+        if not run_id:
+            raise ValueError("resume=True requires a run_id")
+        final_state = load_run(run_id, app)[0]
+    else:
+        final_state = build_initial_state(topic, blog_urls)
+    for _, _, final_state in stream_research(
+        topic, blog_urls, app=app, on_token=on_token, run_id=run_id, resume=resume
+    ):
+        pass
     return final_state
@@ -0,0 +1,216 @@
+"""
+Persistent research job queue and worker pool for the HTTP server.
+
+Jobs and their progress events live in a SQLite file, so queued work
+survives restarts: jobs that were running when the process stopped are
+put back on the queue at startup. Workers share one compiled graph.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+FINISHED = {DONE, FAILED}
+
+_JOB_FIELDS = (
+    "id", "topic", "blog_urls", "status", "created_at", "started_at",
+    "finished_at", "error", "sources", "errors",
+)
+
+
+class JobStore:
+    """Thread-safe SQLite store for jobs, their progress events and reports."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY,"
+                " topic TEXT NOT NULL,"
+                " blog_urls TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " started_at REAL,"
+                " finished_at REAL,"
+                " error TEXT,"
+                " sources INTEGER NOT NULL DEFAULT 0,"
+                " errors INTEGER NOT NULL DEFAULT 0,"
+                " report TEXT)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_queue ON jobs (status, created_at)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS events ("
+                " job_id TEXT NOT NULL,"
+                " seq INTEGER NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " node TEXT NOT NULL,"
+                " message TEXT NOT NULL,"
+                " PRIMARY KEY (job_id, seq))"
+            )
+
+    def submit(self, topic: str, blog_urls: list[str] | None = None) -> str:
+        """Queue a new job and return its id."""
+        job_id = uuid.uuid4().hex[:12]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (id, topic, blog_urls, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, topic, json.dumps(blog_urls or []), QUEUED, time.time()),
+            )
+        return job_id
+
+    def claim(self) -> dict | None:
+        """Atomically move the oldest queued job to running and return it."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                (RUNNING, time.time(), row[0]),
+            )
+        return self.get(row[0])
+
+    def requeue_running(self) -> int:
+        """Put jobs orphaned by a previous process back on the queue."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL WHERE status = ?", (QUEUED, RUNNING)
+            )
+            return cursor.rowcount
+
+    def get(self, job_id: str) -> dict | None:
+        """Return a job's metadata (without the report), or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_JOB_FIELDS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_JOB_FIELDS, row))
+        job["blog_urls"] = json.loads(job["blog_urls"])
+        return job
+
+    def report(self, job_id: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT report FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return row[0] if row else None
+
+    def add_event(self, job_id: str, node: str, message: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO events (job_id, seq, created_at, node, message) "
+                "VALUES (?, (SELECT COALESCE(MAX(seq), 0) + 1 FROM events WHERE job_id = ?), ?, ?, ?)",
+                (job_id, job_id, time.time(), node, message),
+            )
+
+    def events(self, job_id: str, after: int = 0) -> list[dict]:
+        """Progress events with `seq > after`, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, created_at, node, message FROM events "
+                "WHERE job_id = ? AND seq > ? ORDER BY seq",
+                (job_id, after),
+            ).fetchall()
+        return [{"seq": r[0], "created_at": r[1], "node": r[2], "message": r[3]} for r in rows]
+
+    def finish(self, job_id: str, report: str, sources: int, errors: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, report = ?, sources = ?, errors = ? WHERE id = ?",
+                (DONE, time.time(), report, sources, errors, job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                (FAILED, time.time(), error, job_id),
+            )
+
+    def counts(self) -> dict[str, int]:
+        """Number of jobs per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: 0 for status in (QUEUED, RUNNING, DONE, FAILED)} | dict(rows)
+
+
+class WorkerPool:
+    """
+    Background threads that take jobs off a `JobStore` and run the research
+    pipeline, recording each node's progress messages as events.
+    """
+
+    def __init__(self, store: JobStore, workers: int = 4, app=None, poll_interval: float = 0.5):
+        from src.graph import build_graph
+
+        self.store = store
+        self.workers = max(1, workers)
+        self.app = app or build_graph()  # compiled once, shared by every job
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+    def start(self) -> None:
+        self.store.requeue_running()
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._loop, name=f"research-worker-{i + 1}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: float | None = None) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def notify(self) -> None:
+        """Wake idle workers after a job was submitted."""
+        self._wakeup.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            job = self.store.claim()
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+            self._run(job)
+
+    def _run(self, job: dict) -> None:
+        from src.graph import stream_research
+
+        job_id = job["id"]
+        state = {}
+        try:
+            for node_name, node_output, state in stream_research(job["topic"], job["blog_urls"], app=self.app):
+                for message in node_output.get("messages", []):
+                    self.store.add_event(job_id, node_name, message)
+            report = state.get("report", "")
+            if not report:
+                raise RuntimeError("no report was generated")
+            self.store.finish(
+                job_id,
+                report,
+                sources=len(state.get("sources", [])),
+                errors=len(state.get("errors", [])),
+            )
+        except Exception as e:
+            self.store.fail(job_id, str(e) or type(e).__name__)
@@ -0,0 +1,247 @@
+"""
+Persistent cross-run knowledge store.
+
+Every source a run collects is kept in a SQLite file with its fetch time,
+the full text it was fetched with and the summary the run used, indexed
+with FTS5. Later runs look up planned URLs and search queries here first
+and only go to the network for gaps and for entries older than the
+freshness window. The store is bounded by size and evicts the sources
+least recently used by any run.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from src.config import KNOWLEDGE_MAX_BYTES, KNOWLEDGE_MIN_MATCH, KNOWLEDGE_PATH, KNOWLEDGE_TTL
+from src.retrieval import STOPWORDS, tokenize
+
+_TERM = re.compile(r"\w+")
+
+_FIELDS = ("canonical_url", "url", "title", "content", "summary", "snippet", "source_type", "fetched_at")
+
+
+def _match_query(text: str) -> str:
+    """
+    An FTS5 query matching any content word of `text` (quoted, so no syntax
+    leaks through). It only selects candidates; `search` then requires most
+    of the terms to match.
+    """
+    terms = dict.fromkeys(
+        t for t in (t.lower() for t in _TERM.findall(text)) if len(t) > 2 and t not in STOPWORDS
+    )
+    return " OR ".join(f'"{t}"' for t in terms)
+
+
+def _term_overlap(query: str, text: str) -> float:
+    """Share of the query's content words (after plural folding) that occur in `text`."""
+    terms = {t for t in tokenize(query) if len(t) > 2}
+    if not terms:
+        return 0.0
+    return len(terms & set(tokenize(text))) / len(terms)
+
+
+class KnowledgeStore:
+    """Thread-safe SQLite + FTS5 store of collected sources, keyed by canonical URL."""
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float = 7 * 86400,
+        max_bytes: int = 256 * 1024 * 1024,
+        min_match: float = 0.6,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.min_match = min_match
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sources ("
+                " id INTEGER PRIMARY KEY,"
+                " canonical_url TEXT NOT NULL UNIQUE,"
+                " url TEXT NOT NULL,"
+                " title TEXT NOT NULL,"
+                " content TEXT NOT NULL,"
+                " summary TEXT,"
+                " snippet TEXT NOT NULL,"
+                " source_type TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " fetched_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS sources_accessed ON sources (accessed_at)")
+            self._conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS sources_fts USING fts5("
+                " title, content, content='sources', content_rowid='id',"
+                " tokenize='porter unicode61')"
+            )
+
+    def _fresh_after(self) -> float:
+        return time.time() - self.ttl if self.ttl > 0 else float("-inf")
+
+    def _rows_to_docs(self, rows: list[tuple]) -> list[dict]:
+        docs = []
+        now = time.time()
+        for row in rows:
+            entry = dict(zip(("id", *_FIELDS), row))
+            text = entry["summary"] or entry["content"]
+            docs.append({
+                "url": entry["url"],
+                "title": entry["title"],
+                "content": text,
+                "snippet": entry["snippet"],
+                "source_type": entry["source_type"],
+                "word_count": len(text.split()),
+                "canonical_url": entry["canonical_url"],
+            })
+        if rows:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE sources SET accessed_at = ? WHERE id = ?", [(now, row[0]) for row in rows]
+                )
+        return docs
+
+    def get(self, canonical_url: str) -> dict | None:
+        """The stored source for `canonical_url` if it is still fresh, else None."""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT id, {', '.join(_FIELDS)} FROM sources WHERE canonical_url = ? AND fetched_at >= ?",
+                (canonical_url, self._fresh_after()),
+            ).fetchall()
+            docs = self._rows_to_docs(rows)
+        return docs[0] if docs else None
+
+    def search(self, query: str, limit: int = 5) -> list[dict]:
+        """
+        Fresh sources matching `query`, best BM25 match first. A source must
+        contain at least `min_match` of the query's content words, so one
+        shared word ("practices", "history") is not enough.
+        """
+        match = _match_query(query)
+        if not match or limit <= 0:
+            return []
+        with self._lock:
+            candidates = self._conn.execute(
+                f"SELECT s.id, {', '.join('s.' + f for f in _FIELDS)} "
+                "FROM sources_fts JOIN sources s ON s.id = sources_fts.rowid "
+                "WHERE sources_fts MATCH ? AND s.fetched_at >= ? "
+                "ORDER BY bm25(sources_fts) LIMIT ?",
+                (match, self._fresh_after(), limit * 4),
+            ).fetchall()
+            title, content = _FIELDS.index("title") + 1, _FIELDS.index("content") + 1
+            rows = [
+                row for row in candidates
+                if _term_overlap(query, f"{row[title]} {row[content]}") >= self.min_match
+            ]
+            return self._rows_to_docs(rows[:limit])
+
+    def add(self, docs: list[dict], full_text: dict[str, str] | None = None) -> int:
+        """
+        Store (or refresh) sources collected by a run. `full_text` maps a
+        canonical URL to the page text a summarized source was made from.
+        A search snippet never replaces a fresh scraped page for the same
+        URL. Returns the number stored.
+        """
+        full_text = full_text or {}
+        now = time.time()
+        stored = 0
+        with self._lock, self._conn:
+            for doc in docs:
+                key = doc.get("canonical_url")
+                content = doc.get("content", "")
+                if not key or not content:
+                    continue
+                raw = full_text.get(key)
+                body, summary = (raw, content) if raw else (content, None)
+                size = len(body.encode("utf-8")) + len((summary or "").encode("utf-8"))
+
+                old = self._conn.execute(
+                    "SELECT id, title, content, source_type, fetched_at FROM sources WHERE canonical_url = ?",
+                    (key,),
+                ).fetchone()
+                if (
+                    old is not None
+                    and doc.get("source_type") == "web_search"
+                    and old[3] != "web_search"
+                    and old[4] >= self._fresh_after()
+                ):
+                    continue
+                if old is not None:
+                    self._conn.execute(
+                        "INSERT INTO sources_fts (sources_fts, rowid, title, content) VALUES ('delete', ?, ?, ?)",
+                        old[:3],
+                    )
+                    self._conn.execute("DELETE FROM sources WHERE id = ?", (old[0],))
+                cursor = self._conn.execute(
+                    "INSERT INTO sources (canonical_url, url, title, content, summary, snippet,"
+                    " source_type, size, fetched_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key, doc.get("url", ""), doc.get("title", ""), body, summary,
+                        doc.get("snippet", ""), doc.get("source_type", "unknown"), size, now, now,
+                    ),
+                )
+                self._conn.execute(
+                    "INSERT INTO sources_fts (rowid, title, content) VALUES (?, ?, ?)",
+                    (cursor.lastrowid, doc.get("title", ""), body),
+                )
+                stored += 1
+            self._evict()
+        return stored
+
+    def _evict(self) -> None:
+        """Drop least-recently-used sources until the store fits `max_bytes`."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM sources").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute(
+            "SELECT id, title, content, size FROM sources ORDER BY accessed_at ASC"
+        ).fetchall()
+        for row_id, title, content, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute(
+                "INSERT INTO sources_fts (sources_fts, rowid, title, content) VALUES ('delete', ?, ?, ?)",
+                (row_id, title, content),
+            )
+            self._conn.execute("DELETE FROM sources WHERE id = ?", (row_id,))
+            total -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size, fresh = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(fetched_at >= ?), 0) FROM sources",
+                (self._fresh_after(),),
+            ).fetchone()
+        return {"sources": count, "fresh": fresh, "bytes": size}
+
+
+_knowledge_store: KnowledgeStore | None = None
+_knowledge_store_lock = threading.Lock()
+
+
+def get_knowledge_store(
+    path: str = KNOWLEDGE_PATH,
+    ttl: float = KNOWLEDGE_TTL,
+    max_bytes: int = KNOWLEDGE_MAX_BYTES,
+    min_match: float = KNOWLEDGE_MIN_MATCH,
+) -> KnowledgeStore:
+    """Return the process-wide knowledge store, creating it on first use."""
+    global _knowledge_store
+    if _knowledge_store is None:
+        with _knowledge_store_lock:
+            if _knowledge_store is None:
+                _knowledge_store = KnowledgeStore(path, ttl, max_bytes, min_match)
+    return _knowledge_store
@@ -0,0 +1,258 @@
+"""
+Chat model clients — a governed ChatOpenAI, the shared client pool and the
+`get_llm` factory behind `src.config.get_llm`.
+
+Kept out of src/config.py so importing configuration doesn't load
+langchain_openai/openai; this module is imported on the first `get_llm()`.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import os
+import threading
+from typing import Any, AsyncIterator, Iterator
+
+import httpx
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatGenerationChunk, ChatResult
+from langchain_openai import ChatOpenAI
+
+from src.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_BYTES,
+    LLM_CACHE_NODES,
+    LLM_CACHE_PATH,
+    LLM_HTTP_MAX_CONNECTIONS,
+    LLM_HTTP_MAX_KEEPALIVE,
+    LLM_HTTP_TIMEOUT,
+)
+from src.context import count_tokens
+from src.governor import get_governor
+from src.llm_cache import get_llm_cache
+
+
+# ── Governed chat model ──────────────────────────────────────────────
+# Set while a governed call is running so nested calls (e.g. _generate
+# delegating to _stream) don't take a second slot
+_governed_call = contextvars.ContextVar("_governed_call", default=False)
+
+
+def _prompt_tokens(messages: list[BaseMessage]) -> int:
+    return sum(count_tokens(m.content if isinstance(m.content, str) else str(m.content)) for m in messages)
+
+
+def _output_tokens(message: BaseMessage) -> int:
+    usage = getattr(message, "usage_metadata", None)
+    if usage and usage.get("output_tokens"):
+        return usage["output_tokens"]
+    return count_tokens(message.content if isinstance(message.content, str) else str(message.content))
+
+
+class GovernedChatOpenAI(ChatOpenAI):
+    """
+    ChatOpenAI whose API calls go through the shared "llm" governor
+    (src/governor.py): requests/min and tokens/min buckets, adaptive
+    concurrency and Retry-After aware retries. The client's own retries are
+    disabled so 429s reach the governor.
+    """
+
+    def _generate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if _governed_call.get():
+            return super()._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        governor = get_governor("llm")
+        parent = super()._generate
+
+        def call() -> ChatResult:
+            token = _governed_call.set(True)
+            try:
+                return parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+            finally:
+                _governed_call.reset(token)
+
+        result = governor.call(call, tokens=_prompt_tokens(messages))
+        for generation in result.generations:
+            governor.tokens.charge(_output_tokens(generation.message))
+        return result
+
+    async def _agenerate(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if _governed_call.get():
+            return await super()._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+        governor = get_governor("llm")
+        parent = super()._agenerate
+
+        async def call() -> ChatResult:
+            token = _governed_call.set(True)
+            try:
+                return await parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+            finally:
+                _governed_call.reset(token)
+
+        result = await governor.acall(call, tokens=_prompt_tokens(messages))
+        for generation in result.generations:
+            governor.tokens.charge(_output_tokens(generation.message))
+        return result
+
+    def _stream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> Iterator[ChatGenerationChunk]:
+        parent = super()._stream
+        if _governed_call.get():
+            yield from parent(messages, stop=stop, run_manager=run_manager, **kwargs)
+            return
+        governor = get_governor("llm")
+        output = 0
+        for chunk in governor.stream(
+            lambda: parent(messages, stop=stop, run_manager=run_manager, **kwargs),
+            tokens=_prompt_tokens(messages),
+        ):
+            output += len(chunk.text)
+            yield chunk
+        governor.tokens.charge(output // 4)
+
+    async def _astream(
+        self,
+        messages: list[BaseMessage],
+        stop: list[str] | None = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        parent = super()._astream
+        if _governed_call.get():
+            async for chunk in parent(messages, stop=stop, run_manager=run_manager, **kwargs):
+                yield chunk
+            return
+        governor = get_governor("llm")
+        output = 0
+        async for chunk in governor.astream(
+            lambda: parent(messages, stop=stop, run_manager=run_manager, **kwargs),
+            tokens=_prompt_tokens(messages),
+        ):
+            output += len(chunk.text)
+            yield chunk
+        governor.tokens.charge(output // 4)
+
+
+# ── Shared LLM client pool ───────────────────────────────────────────
+_llm_pool: dict[tuple, ChatOpenAI] = {}
+_llm_pool_lock = threading.Lock()
+_llm_pool_hits = 0
+_llm_pool_misses = 0
+_http_clients: tuple[httpx.Client, httpx.AsyncClient] | None = None
+
+
+def _get_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """One sync and one async connection pool shared by every pooled client."""
+    global _http_clients
+    if _http_clients is None:
+        limits = httpx.Limits(
+            max_connections=LLM_HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_HTTP_MAX_KEEPALIVE,
+        )
+        timeout = httpx.Timeout(LLM_HTTP_TIMEOUT, connect=10.0)
+        _http_clients = (
+            httpx.Client(limits=limits, timeout=timeout),
+            httpx.AsyncClient(limits=limits, timeout=timeout),
+        )
+    return _http_clients
+
+
+def llm_pool_stats() -> dict:
+    """Return counters for the shared LLM client pool."""
+    with _llm_pool_lock:
+        return {
+            "clients": len(_llm_pool),
+            "hits": _llm_pool_hits,
+            "misses": _llm_pool_misses,
+            "max_connections": LLM_HTTP_MAX_CONNECTIONS,
+            "max_keepalive_connections": LLM_HTTP_MAX_KEEPALIVE,
+        }
+
+
+# Optional replacement for the ChatOpenAI factory (see set_llm_factory)
+_llm_factory = None
+
+
+def set_llm_factory(factory) -> None:
+    """
+    Route every `get_llm()` call through `factory(model=..., temperature=...,
+    streaming=..., node=...)`; pass None to restore ChatOpenAI. Used by the
+    offline benchmarks to swap in a fake chat model.
+    """
+    global _llm_factory
+    _llm_factory = factory
+
+
+def get_llm(
+    model: str | None = None,
+    temperature: float | None = None,
+    streaming: bool = True,
+    node: str | None = None,
+) -> ChatOpenAI:
+    """
+    Return a configured (governed) ChatOpenAI instance.
+
+    Clients are pooled per process, keyed by (model, temperature, streaming,
+    cache), and all share one tuned HTTP connection pool, so repeated calls
+    reuse keep-alive connections to the API. ChatOpenAI holds no per-call
+    state, so pooled clients are safe to share across threads and tasks.
+    Every API call is rate limited and retried by the "llm" governor.
+
+    Reads defaults from environment variables:
+        LLM_MODEL       (default: gpt-4o-mini)
+        LLM_TEMPERATURE (default: 0.2)
+
+    `node` names the calling agent/tool ("planner", "summarizer", ...); when
+    the response cache is enabled for that node, identical prompts are
+    answered from `LLM_CACHE_PATH` instead of the API.
+    """
+    model = model or os.getenv("LLM_MODEL", "gpt-4o-mini")
+    temperature = (
+        temperature
+        if temperature is not None
+        else float(os.getenv("LLM_TEMPERATURE", "0.2"))
+    )
+
+    if _llm_factory is not None:
+        return _llm_factory(model=model, temperature=temperature, streaming=streaming, node=node)
+
+    global _llm_pool_hits, _llm_pool_misses
+    use_cache = LLM_CACHE_ENABLED and node in LLM_CACHE_NODES
+    key = (model, temperature, streaming, use_cache)
+
+    with _llm_pool_lock:
+        llm = _llm_pool.get(key)
+        if llm is not None:
+            _llm_pool_hits += 1
+            return llm
+
+        _llm_pool_misses += 1
+        http_client, http_async_client = _get_http_clients()
+        llm = GovernedChatOpenAI(
+            model=model,
+            temperature=temperature,
+            streaming=streaming,
+            cache=get_llm_cache(LLM_CACHE_PATH, LLM_CACHE_MAX_BYTES) if use_cache else None,
+            http_client=http_client,
+            http_async_client=http_async_client,
+            max_retries=0,  # retries are handled by the governor
+            stream_usage=True,  # token usage for streamed calls (metrics)
+        )
+        _llm_pool[key] = llm
+        return llm
@@ -0,0 +1,78 @@
+"""
+Content-addressed LLM response cache.
+
+Plugs into LangChain's per-model `cache` hook, so a cache hit short-circuits
+the chat model before any network call. Entries are keyed by a hash of the
+model parameters (model name, temperature, ...) and the serialized messages.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from typing import Any, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+from src.cache import SqliteCache
+
+
+def _encode(generation: Generation) -> dict:
+    if isinstance(generation, ChatGeneration):
+        return {
+            "message": message_to_dict(generation.message),
+            "generation_info": generation.generation_info,
+        }
+    return {"text": generation.text, "generation_info": generation.generation_info}
+
+
+def _decode(data: dict) -> Generation:
+    if "message" in data:
+        message = messages_from_dict([data["message"]])[0]
+        return ChatGeneration(message=message, generation_info=data.get("generation_info"))
+    return Generation(text=data["text"], generation_info=data.get("generation_info"))
+
+
+class SqliteLLMCache(BaseCache):
+    """LangChain cache backed by the size-bounded `SqliteCache` store."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self._store = SqliteCache(path, table="llm_responses", max_bytes=max_bytes)
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\n{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Sequence[Generation] | None:
+        found = self._store.get(self._key(prompt, llm_string))
+        if found is None:
+            return None
+        try:
+            return [_decode(g) for g in json.loads(found[0])]
+        except Exception:
+            # Entry written by an incompatible LangChain version — treat as a miss
+            return None
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        payload = json.dumps([_encode(g) for g in return_val])
+        self._store.set(self._key(prompt, llm_string), payload.encode("utf-8"))
+
+    def clear(self, **kwargs: Any) -> None:
+        self._store.clear()
+
+
+_llm_cache: SqliteLLMCache | None = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache(path: str, max_bytes: int) -> SqliteLLMCache:
+    """Return the process-wide LLM response cache, creating it on first use."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = SqliteLLMCache(path, max_bytes)
+    return _llm_cache
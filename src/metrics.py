@@ -0,0 +1,320 @@
+"""
+Structured run metrics — spans for every graph node, LLM call and tool call.
+
+Each node runs inside a collector (a context variable, copied into worker
+threads by `run_ordered` and LangChain's batch executor). LLM calls are
+recorded by `MetricsCallbackHandler` and tools record their own spans, so
+the node wrapper can emit one node span with rolled-up totals followed by
+its child spans. The spans accumulate in `ResearchState["trace"]` and can
+be exported as JSONL or to an installed OpenTelemetry SDK.
+
+A span is a plain dict:
+    {"span_id", "parent_id", "kind": "node" | "llm" | "tool", "name",
+     "start": <unix seconds>, "duration_ms", "attributes": {...}}
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.state import merge_sources
+
+
+def _span_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+class _Collector:
+    """Spans recorded while one node runs (shared by its worker threads)."""
+
+    def __init__(self, span_id: str):
+        self.span_id = span_id
+        self.spans: list[dict] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: dict) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+
+_collector: contextvars.ContextVar[_Collector | None] = contextvars.ContextVar("_collector", default=None)
+_attributes: contextvars.ContextVar[dict | None] = contextvars.ContextVar("_attributes", default=None)
+
+
+def record(kind: str, name: str, start: float, duration: float, **attributes: Any) -> None:
+    """Add a finished span to the current node's collector (no-op outside a node)."""
+    collector = _collector.get()
+    if collector is None:
+        return
+    collector.add({
+        "span_id": _span_id(),
+        "parent_id": collector.span_id,
+        "kind": kind,
+        "name": name,
+        "start": start,
+        "duration_ms": round(duration * 1000, 2),
+        "attributes": attributes,
+    })
+
+
+@contextmanager
+def span(kind: str, name: str, **attributes: Any) -> Iterator[dict]:
+    """Time a block as a span; `annotate()` inside it adds attributes."""
+    attributes = dict(attributes)
+    token = _attributes.set(attributes)
+    start, t0 = time.time(), time.perf_counter()
+    try:
+        yield attributes
+    except Exception as e:
+        attributes["error"] = str(e) or type(e).__name__
+        raise
+    finally:
+        _attributes.reset(token)
+        record(kind, name, start, time.perf_counter() - t0, **attributes)
+
+
+def annotate(**attributes: Any) -> None:
+    """Attach attributes to the innermost open `span()` (no-op outside one)."""
+    current = _attributes.get()
+    if current is not None:
+        current.update(attributes)
+
+
+# ── LLM calls ────────────────────────────────────────────────────────
+def _message_tokens(messages) -> int:
+    from src.context import count_tokens
+
+    return sum(count_tokens(m.content if isinstance(m.content, str) else str(m.content)) for m in messages)
+
+
+class MetricsCallbackHandler(BaseCallbackHandler):
+    """Records one `llm` span per chat model call, with token usage."""
+
+    def __init__(self):
+        self._started: dict[Any, tuple[float, float, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        model = (kwargs.get("invocation_params") or {}).get("model_name") or (serialized or {}).get("name", "")
+        prompt = sum(_message_tokens(batch) for batch in messages)
+        with self._lock:
+            self._started[run_id] = (time.time(), time.perf_counter(), prompt, model)
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started is None:
+            return
+        start, t0, prompt_estimate, model = started
+
+        prompt_tokens = completion_tokens = 0
+        usage_found = False
+        for generations in response.generations:
+            for generation in generations:
+                message = getattr(generation, "message", None)
+                usage = getattr(message, "usage_metadata", None)
+                if usage:
+                    usage_found = True
+                    prompt_tokens += usage.get("input_tokens", 0)
+                    completion_tokens += usage.get("output_tokens", 0)
+                else:
+                    from src.context import count_tokens
+
+                    completion_tokens += count_tokens(generation.text)
+        if not usage_found:
+            prompt_tokens = prompt_estimate
+
+        record(
+            "llm",
+            model or "chat_model",
+            start,
+            time.perf_counter() - t0,
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            usage_reported=usage_found,
+        )
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        with self._lock:
+            started = self._started.pop(run_id, None)
+        if started is not None:
+            start, t0, prompt_estimate, model = started
+            record("llm", model or "chat_model", start, time.perf_counter() - t0,
+                   prompt_tokens=prompt_estimate, completion_tokens=0, error=str(error))
+
+
+metrics_handler = MetricsCallbackHandler()
+
+
+# ── Graph nodes ──────────────────────────────────────────────────────
+def _rollup(spans: list[dict]) -> dict:
+    totals = {
+        "llm_calls": 0,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "tool_calls": 0,
+        "http_bytes": 0,
+        "cache_hits": 0,
+    }
+    statuses: dict[str, int] = defaultdict(int)
+    for s in spans:
+        attrs = s["attributes"]
+        if s["kind"] == "llm":
+            totals["llm_calls"] += 1
+            totals["prompt_tokens"] += attrs.get("prompt_tokens", 0)
+            totals["completion_tokens"] += attrs.get("completion_tokens", 0)
+        elif s["kind"] == "tool":
+            totals["tool_calls"] += 1
+            totals["http_bytes"] += attrs.get("bytes", 0)
+            if attrs.get("cache") in ("hit", "revalidated"):
+                totals["cache_hits"] += 1
+            if "status" in attrs:
+                statuses[str(attrs["status"])] += 1
+    if statuses:
+        totals["http_status"] = dict(statuses)
+    return totals
+
+
+def instrument_node(name: str, fn: Callable[[dict], dict]) -> Callable[[dict], dict]:
+    """
+    Wrap a graph node so its output carries a `trace` of spans: one `node`
+    span with wall time, token/HTTP/cache totals and source counts, followed
+    by the LLM and tool spans recorded while it ran.
+    """
+
+    def node(state: dict) -> dict:
+        collector = _Collector(_span_id())
+        token = _collector.set(collector)
+        start, t0 = time.time(), time.perf_counter()
+        try:
+            output = fn(state) or {}
+        finally:
+            _collector.reset(token)
+        duration = time.perf_counter() - t0
+
+        attributes = _rollup(collector.spans)
+        existing = state.get("sources", [])
+        if "sources" in output:
+            # Count through the state reducer: re-emitted or merged sources aren't new
+            merged = merge_sources(existing, output["sources"])
+            attributes["new_sources"] = len(merged) - len(existing)
+            attributes["total_sources"] = len(merged)
+        else:
+            attributes["total_sources"] = len(existing)
+        attributes["iteration"] = output.get("iteration", state.get("iteration", 0))
+
+        node_span = {
+            "span_id": collector.span_id,
+            "parent_id": None,
+            "kind": "node",
+            "name": name,
+            "start": start,
+            "duration_ms": round(duration * 1000, 2),
+            "attributes": attributes,
+        }
+        return {**output, "trace": [node_span, *collector.spans]}
+
+    node.__name__ = getattr(fn, "__name__", name)
+    node.__doc__ = fn.__doc__
+    return node
+
+
+# ── Reporting and export ─────────────────────────────────────────────
+def summarize(trace: list[dict]) -> list[dict]:
+    """One row per node name (summed over loop iterations), in first-run order."""
+    rows: dict[str, dict] = {}
+    for s in trace:
+        if s["kind"] != "node":
+            continue
+        row = rows.setdefault(s["name"], {"node": s["name"], "runs": 0, "duration_ms": 0.0})
+        row["runs"] += 1
+        row["duration_ms"] = round(row["duration_ms"] + s["duration_ms"], 2)
+        for key, value in s["attributes"].items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool) and key not in ("iteration", "total_sources"):
+                row[key] = row.get(key, 0) + value
+        row["total_sources"] = s["attributes"].get("total_sources", 0)
+    return list(rows.values())
+
+
+def format_summary(trace: list[dict]) -> str:
+    """Per-node breakdown table for the CLI."""
+    rows = summarize(trace)
+    lines = [
+        f"{'node':<11} {'runs':>4} {'wall s':>8} {'llm':>4} {'prompt tok':>10} {'compl tok':>9} "
+        f"{'tools':>5} {'http KB':>8} {'cache':>5} {'sources':>7}",
+        "-" * 81,
+    ]
+    for r in rows:
+        lines.append(
+            f"{r['node']:<11} {r['runs']:>4} {r['duration_ms'] / 1000:>8.2f} {r.get('llm_calls', 0):>4} "
+            f"{r.get('prompt_tokens', 0):>10} {r.get('completion_tokens', 0):>9} {r.get('tool_calls', 0):>5} "
+            f"{r.get('http_bytes', 0) / 1024:>8.1f} {r.get('cache_hits', 0):>5} {r.get('total_sources', 0):>7}"
+        )
+    total = sum(r["duration_ms"] for r in rows) / 1000
+    lines.append("-" * 81)
+    lines.append(f"{'total':<11} {'':>4} {total:>8.2f}")
+    return "\n".join(lines)
+
+
+def _otel_span(s: dict, trace_id: str) -> dict:
+    start_ns = int(s["start"] * 1e9)
+    return {
+        "trace_id": trace_id,
+        "span_id": s["span_id"],
+        "parent_span_id": s["parent_id"],
+        "name": f"{s['kind']}:{s['name']}",
+        "kind": "INTERNAL",
+        "start_time_unix_nano": start_ns,
+        "end_time_unix_nano": start_ns + int(s["duration_ms"] * 1e6),
+        "status": {"code": "ERROR" if "error" in s["attributes"] else "OK"},
+        "attributes": {"research.kind": s["kind"], **s["attributes"]},
+    }
+
+
+def export_jsonl(trace: list[dict], path: str, trace_id: str | None = None) -> str:
+    """
+    Append the run's spans to `path`, one OpenTelemetry-style JSON span per
+    line, all sharing `trace_id`. Returns the trace id.
+    """
+    trace_id = trace_id or uuid.uuid4().hex
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "a", encoding="utf-8") as f:
+        for s in trace:
+            f.write(json.dumps(_otel_span(s, trace_id), ensure_ascii=False, default=str) + "\n")
+    return trace_id
+
+
+def export_otel(trace: list[dict], tracer_name: str = "research_assistant") -> None:
+    """Replay the spans into the configured OpenTelemetry tracer (optional dependency)."""
+    from opentelemetry import trace as otel_trace
+
+    tracer = otel_trace.get_tracer(tracer_name)
+    by_id = {s["span_id"]: s for s in trace}
+    live: dict[str, Any] = {}
+    for s in sorted(trace, key=lambda s: s["parent_id"] is not None):
+        parent = live.get(s["parent_id"]) if s["parent_id"] in by_id else None
+        context = otel_trace.set_span_in_context(parent) if parent else None
+        start_ns = int(s["start"] * 1e9)
+        otel_span = tracer.start_span(
+            f"{s['kind']}:{s['name']}",
+            context=context,
+            start_time=start_ns,
+            attributes={
+                k: v if isinstance(v, (str, bool, int, float)) else json.dumps(v)
+                for k, v in s["attributes"].items()
+            },
+        )
+        otel_span.end(end_time=start_ns + int(s["duration_ms"] * 1e6))
+        live[s["span_id"]] = otel_span
@@ -0,0 +1,148 @@
+"""
+Per-run lexical retrieval over source contents.
+
+Sources are cut into sentence-aligned chunks and indexed with Okapi BM25.
+Postings are stored as flat numpy arrays sorted by term, with each
+posting's BM25 weight precomputed, so scoring a query is a handful of
+slices plus one `np.bincount`.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+|\n+")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Function words that would otherwise dominate short queries
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how in is it its "
+    "of on or that the their this to was were what when where which who why "
+    "will with".split()
+)
+
+
+def _stem(token: str) -> str:
+    """Fold plurals and third-person forms ("agents", "uses", "studies")."""
+    if len(token) > 4 and token.endswith("ies"):
+        return token[:-3] + "y"
+    if len(token) > 3 and token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> list[str]:
+    return [_stem(t) for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+@dataclass
+class Chunk:
+    """A passage of one source; `source` indexes into the run's sources."""
+    source: int
+    text: str
+
+
+def chunk_text(text: str, max_words: int = 120) -> list[str]:
+    """Split `text` into chunks of at most ~`max_words` words at sentence boundaries."""
+    chunks: list[str] = []
+    current: list[str] = []
+    size = 0
+    for sentence in _SENTENCE_END.split(text):
+        words = sentence.split()
+        if not words:
+            continue
+        # Sentences longer than a chunk (lists, run-on text) are split by words
+        while len(words) > max_words:
+            if current:
+                chunks.append(" ".join(current))
+                current, size = [], 0
+            chunks.append(" ".join(words[:max_words]))
+            words = words[max_words:]
+        if size + len(words) > max_words and current:
+            chunks.append(" ".join(current))
+            current, size = [], 0
+        current.append(" ".join(words))
+        size += len(words)
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+class BM25Index:
+    """Okapi BM25 over a fixed list of documents."""
+
+    def __init__(self, documents: list[str], k1: float = 1.5, b: float = 0.75):
+        self.n_docs = len(documents)
+        vocabulary: dict[str, int] = {}
+        doc_ids: list[int] = []
+        term_ids: list[int] = []
+        lengths = np.zeros(self.n_docs, dtype=np.float64)
+
+        for d, text in enumerate(documents):
+            tokens = tokenize(text)
+            lengths[d] = len(tokens)
+            ids = [vocabulary.setdefault(t, len(vocabulary)) for t in tokens]
+            doc_ids.extend([d] * len(ids))
+            term_ids.extend(ids)
+
+        self.vocabulary = vocabulary
+        if not term_ids:
+            self.idf = np.zeros(0)
+            self._docs = np.zeros(0, dtype=np.int64)
+            self._weights = np.zeros(0)
+            self._offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+            return
+
+        # Term frequencies: unique (term, doc) pairs with their counts
+        pairs = np.array(term_ids, dtype=np.int64) * max(self.n_docs, 1) + np.array(doc_ids, dtype=np.int64)
+        unique, tf = np.unique(pairs, return_counts=True)  # sorted by term, then doc
+        terms = unique // max(self.n_docs, 1)
+        docs = unique % max(self.n_docs, 1)
+
+        df = np.bincount(terms, minlength=len(vocabulary))
+        idf = np.log(1.0 + (self.n_docs - df + 0.5) / (df + 0.5))
+        avgdl = lengths.mean() or 1.0
+        norm = k1 * (1.0 - b + b * lengths / avgdl)
+
+        self.idf = idf
+        self._docs = docs
+        self._weights = idf[terms] * tf * (k1 + 1.0) / (tf + norm[docs])
+        self._offsets = np.searchsorted(terms, np.arange(len(vocabulary) + 1))
+
+    def scores(self, query: str) -> np.ndarray:
+        """BM25 score of every document for `query`."""
+        ids = {self.vocabulary[t] for t in tokenize(query) if t in self.vocabulary}
+        if not ids:
+            return np.zeros(self.n_docs)
+        slices = [slice(self._offsets[t], self._offsets[t + 1]) for t in ids]
+        docs = np.concatenate([self._docs[s] for s in slices])
+        weights = np.concatenate([self._weights[s] for s in slices])
+        return np.bincount(docs, weights=weights, minlength=self.n_docs)
+
+    def search(self, query: str, k: int) -> list[tuple[int, float]]:
+        """Top-`k` `(doc_index, score)` pairs with a positive score, best first."""
+        scores = self.scores(query)
+        if k <= 0 or not scores.any():
+            return []
+        k = min(k, self.n_docs)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+
+class SourceRetriever:
+    """Chunks a run's sources and retrieves evidence per question."""
+
+    def __init__(self, contents: list[str], chunk_words: int = 120):
+        self.chunks = [
+            Chunk(source=i, text=piece)
+            for i, content in enumerate(contents)
+            for piece in chunk_text(content, chunk_words)
+        ]
+        self.index = BM25Index([c.text for c in self.chunks])
+
+    def retrieve(self, question: str, k: int) -> list[tuple[Chunk, float]]:
+        return [(self.chunks[i], score) for i, score in self.index.search(question, k)]
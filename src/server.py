@@ -0,0 +1,181 @@
+"""
+HTTP job server for the research assistant.
+
+Research runs take minutes, so requests only enqueue work: a pool of
+worker threads drains a persistent SQLite queue (src/jobs.py) using one
+shared compiled graph, and clients poll or stream progress.
+
+Endpoints:
+    POST /jobs                {"topic": "...", "blogs": ["https://..."]}  → 202 {"id", "status"}
+    GET  /jobs/<id>           job status and metadata
+    GET  /jobs/<id>/events    progress as Server-Sent Events (`?after=<seq>` to resume)
+    GET  /jobs/<id>/report    the markdown report (409 until the job is done)
+    GET  /healthz             worker count and queue depth
+
+Usage:
+    python -m src.server --port 8000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from src.config import JOBS_DB_PATH, SERVER_HOST, SERVER_PORT, SERVER_WORKERS
+from src.jobs import DONE, FINISHED, JobStore, WorkerPool
+
+_JOB_PATH = re.compile(r"^/jobs/([0-9a-f]+)(/events|/report)?$")
+MAX_BODY_BYTES = 64 * 1024
+EVENT_POLL_INTERVAL = 0.5  # seconds between event-table polls while streaming
+
+
+class ResearchRequestHandler(BaseHTTPRequestHandler):
+    server_version = "ResearchAssistant/0.1"
+
+    # Set by `make_server`
+    store: JobStore
+    pool: WorkerPool
+
+    # ── Helpers ──────────────────────────────────────────────────
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        self._send_json(status, {"error": message})
+
+    def _read_json(self) -> dict | None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0 or length > MAX_BODY_BYTES:
+            return None
+        try:
+            payload = json.loads(self.rfile.read(length))
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    # ── Routes ───────────────────────────────────────────────────
+    def do_POST(self):
+        if urlsplit(self.path).path != "/jobs":
+            return self._error(HTTPStatus.NOT_FOUND, "not found")
+
+        payload = self._read_json()
+        topic = (payload or {}).get("topic")
+        if not isinstance(topic, str) or not topic.strip():
+            return self._error(HTTPStatus.BAD_REQUEST, 'expected a JSON body with a "topic" string')
+
+        blogs = payload.get("blogs", payload.get("blog_urls", []))
+        if isinstance(blogs, str):
+            blogs = [u.strip() for u in blogs.split(",") if u.strip()]
+        if not isinstance(blogs, list) or not all(isinstance(u, str) for u in blogs):
+            return self._error(HTTPStatus.BAD_REQUEST, '"blogs" must be a list of URLs')
+
+        job_id = self.store.submit(topic.strip(), blogs)
+        self.pool.notify()
+        self._send_json(HTTPStatus.ACCEPTED, {"id": job_id, "status": "queued"})
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == "/healthz":
+            return self._send_json(HTTPStatus.OK, {"workers": self.pool.workers, "jobs": self.store.counts()})
+
+        match = _JOB_PATH.match(parts.path)
+        if not match:
+            return self._error(HTTPStatus.NOT_FOUND, "not found")
+        job_id, action = match.groups()
+        job = self.store.get(job_id)
+        if job is None:
+            return self._error(HTTPStatus.NOT_FOUND, f"unknown job {job_id}")
+
+        if action is None:
+            return self._send_json(HTTPStatus.OK, job)
+        if action == "/report":
+            return self._send_report(job)
+        after = parse_qs(parts.query).get("after", ["0"])[0]
+        self._stream_events(job_id, int(after) if after.isdigit() else 0)
+
+    def _send_report(self, job: dict) -> None:
+        if job["status"] != DONE:
+            return self._error(HTTPStatus.CONFLICT, f"job is {job['status']}")
+        body = (self.store.report(job["id"]) or "").encode("utf-8")
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/markdown; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_events(self, job_id: str, after: int) -> None:
+        """Server-Sent Events: one `progress` event per message, then `end`."""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        try:
+            while True:
+                # Read the status first so no event written before it finished is missed
+                job = self.store.get(job_id)
+                for event in self.store.events(job_id, after):
+                    after = event["seq"]
+                    self._write_event("progress", event, event_id=after)
+                if job["status"] in FINISHED:
+                    self._write_event("end", {"status": job["status"], "error": job["error"]})
+                    return
+                time.sleep(EVENT_POLL_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away
+
+    def _write_event(self, event: str, data: dict, event_id: int | None = None) -> None:
+        lines = [f"event: {event}"]
+        if event_id is not None:
+            lines.append(f"id: {event_id}")
+        lines.append(f"data: {json.dumps(data, ensure_ascii=False)}")
+        self.wfile.write(("\n".join(lines) + "\n\n").encode("utf-8"))
+        self.wfile.flush()
+
+
+def make_server(
+    host: str = SERVER_HOST,
+    port: int = SERVER_PORT,
+    workers: int = SERVER_WORKERS,
+    db_path: str = JOBS_DB_PATH,
+) -> tuple[ThreadingHTTPServer, WorkerPool]:
+    """Create the HTTP server and its (not yet started) worker pool."""
+    store = JobStore(db_path)
+    pool = WorkerPool(store, workers=workers)
+    handler = type("Handler", (ResearchRequestHandler,), {"store": store, "pool": pool})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="🔬 Research assistant job server")
+    parser.add_argument("--host", default=SERVER_HOST, help=f"Bind address (default: {SERVER_HOST})")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help=f"Port (default: {SERVER_PORT})")
+    parser.add_argument("--workers", type=int, default=SERVER_WORKERS, help=f"Concurrent research jobs (default: {SERVER_WORKERS})")
+    parser.add_argument("--db", default=JOBS_DB_PATH, help=f"SQLite job queue (default: {JOBS_DB_PATH})")
+    args = parser.parse_args()
+
+    server, pool = make_server(args.host, args.port, args.workers, args.db)
+    pool.start()
+    print(f"🔬 Research server on http://{args.host}:{args.port} with {pool.workers} worker(s)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.stop(timeout=1)
+
+
+if __name__ == "__main__":
+    main()
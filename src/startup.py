@@ -0,0 +1,98 @@
+"""
+Import-time profiling for `main.py --profile-startup`.
+
+Runs `python -X importtime` in a fresh interpreter (so nothing is already
+cached in `sys.modules`) and aggregates the per-module timings.
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What the CLI imports before it parses arguments
+CLI_MODULES = ["main"]
+# What a research run loads on first use of each node and tool
+PIPELINE_MODULES = [
+    "src.graph",
+    "src.llm",
+    "src.tools.http_client",
+    "src.fingerprint",
+    "bs4",
+]
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_imports(modules: list[str]) -> list[ImportTiming]:
+    """Import `modules` in a fresh interpreter and return every module's timing."""
+    code = "; ".join(f"import {m}" for m in modules)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {', '.join(modules)} failed:\n{proc.stderr[-2000:]}")
+
+    timings = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            timing = ImportTiming(
+                module=name.strip(),
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                depth=(len(name) - len(name.lstrip())) // 2,
+            )
+        except ValueError:
+            continue  # header row
+        timings.append(timing)
+    return timings
+
+
+def total_ms(timings: list[ImportTiming]) -> float:
+    """Wall time of the top-level imports, in milliseconds."""
+    top = min((t.depth for t in timings), default=0)
+    return sum(t.cumulative_us for t in timings if t.depth == top) / 1000
+
+
+def by_package(timings: list[ImportTiming]) -> list[tuple[str, float, int]]:
+    """`(package, self ms, modules)` per top-level package, slowest first."""
+    totals: dict[str, list] = defaultdict(lambda: [0, 0])
+    for t in timings:
+        entry = totals[t.module.split(".")[0]]
+        entry[0] += t.self_us
+        entry[1] += 1
+    return sorted(
+        ((name, us / 1000, count) for name, (us, count) in totals.items()),
+        key=lambda row: row[1],
+        reverse=True,
+    )
+
+
+def format_profile(title: str, timings: list[ImportTiming], top: int = 12) -> str:
+    lines = [f"{title}: {total_ms(timings):.0f} ms, {len(timings)} modules", ""]
+    lines.append(f"  {'package':<28} {'self ms':>9} {'modules':>8}")
+    for name, ms, count in by_package(timings)[:top]:
+        lines.append(f"  {name:<28} {ms:>9.1f} {count:>8}")
+    lines.append("")
+    lines.append(f"  {'slowest modules (cumulative)':<44} {'ms':>9}")
+    heaviest = sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]
+    for t in heaviest:
+        lines.append(f"  {t.module:<44} {t.cumulative_us / 1000:>9.1f}")
+    return "\n".join(lines)
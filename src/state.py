@@ -7,6 +7,8 @@ from __future__ import annotations
 import operator
 from typing import Annotated, TypedDict
 
+from src.urls import canonical_url
+
 
 class SourceDocument(TypedDict, total=False):
     """A single source document collected during research."""
@@ -16,6 +18,53 @@ class SourceDocument(TypedDict, total=False):
     snippet: str
     source_type: str  # "web_search" | "blog" | "manual"
     word_count: int
+    canonical_url: str          # dedup key, see src/urls.py
+    alternate_urls: list[str]   # other URLs merged into this source
+
+
+def _merge_source(existing: SourceDocument, new: SourceDocument) -> SourceDocument:
+    """Merge two documents for the same page, keeping the richer content."""
+    richer = len(new.get("content", "")) > len(existing.get("content", ""))
+    merged = dict(new if richer else existing)
+
+    alternates = []
+    for url in (
+        *existing.get("alternate_urls", []),
+        existing.get("url", ""),
+        *new.get("alternate_urls", []),
+        new.get("url", ""),
+    ):
+        if url and url != merged.get("url") and url not in alternates:
+            alternates.append(url)
+    if alternates:
+        merged["alternate_urls"] = alternates
+    return merged
+
+
+def merge_sources(
+    existing: list[SourceDocument],
+    new: list[SourceDocument],
+) -> list[SourceDocument]:
+    """
+    Reducer for `ResearchState.sources` — appends new documents, but merges
+    any whose canonical URL is already present instead of duplicating it.
+    """
+    merged = list(existing)
+    index = {}
+    for i, doc in enumerate(merged):
+        key = doc.get("canonical_url") or canonical_url(doc.get("url", ""))
+        if key:
+            index.setdefault(key, i)
+
+    for doc in new:
+        key = doc.get("canonical_url") or canonical_url(doc.get("url", ""))
+        if key and key in index:
+            merged[index[key]] = _merge_source(merged[index[key]], doc)
+        else:
+            if key:
+                index[key] = len(merged)
+            merged.append(doc)
+    return merged
 
 
 class ResearchPlan(TypedDict, total=False):
@@ -31,6 +80,8 @@ class ResearchState(TypedDict, total=False):
 
     Fields using `Annotated[..., operator.add]` are append-only lists —
     each node can return new items and they'll be merged automatically.
+    `sources` uses `merge_sources`, which also collapses documents sharing
+    a canonical URL.
     """
 
     # ── User inputs ───────────────────────────────────────────────
@@ -41,7 +92,8 @@ class ResearchState(TypedDict, total=False):
     research_plan: ResearchPlan
 
     # ── Data collection ───────────────────────────────────────────
-    sources: Annotated[list[SourceDocument], operator.add]
+    sources: Annotated[list[SourceDocument], merge_sources]
+    scraped_urls: Annotated[list[str], operator.add]  # canonical URLs already fetched
 
     # ── Analysis & output ─────────────────────────────────────────
     analysis: str
@@ -51,7 +103,10 @@ class ResearchState(TypedDict, total=False):
     iteration: int          # current research loop iteration
     max_iterations: int     # max allowed iterations (default 2)
     enough_data: bool       # set by researcher when data is sufficient
+    coverage: float         # share of sub-questions the sources cover (src/sufficiency.py)
+    coverage_gaps: list[str]  # sub-questions not yet covered, for the next plan
 
     # ── Logging ───────────────────────────────────────────────────
     errors: Annotated[list[str], operator.add]
     messages: Annotated[list[str], operator.add]
+    trace: Annotated[list[dict], operator.add]  # metric spans (see src/metrics.py)
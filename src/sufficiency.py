@@ -0,0 +1,188 @@
+"""
+Research sufficiency — how well the collected sources cover the plan.
+
+Each planner sub-question gets a coverage score in [0, 1]; a question is
+covered once its score reaches `SUFFICIENCY_QUESTION_SCORE`, and the run
+has enough data once the covered share reaches `SUFFICIENCY_THRESHOLD`.
+
+Evaluators are registered in `EVALUATORS` and selected with
+`SUFFICIENCY_EVALUATOR`:
+
+- "lexical" (default, no LLM call): the best IDF-weighted share of a
+  question's terms found together in one source passage.
+- "llm": a judge model rates each question against the packed sources,
+  falling back to the lexical scores if the call fails or its answer
+  can't be parsed.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.config import (
+    RETRIEVAL_CHUNK_WORDS,
+    SUFFICIENCY_EVALUATOR,
+    SUFFICIENCY_JUDGE_TOKEN_BUDGET,
+    SUFFICIENCY_QUESTION_SCORE,
+    SUFFICIENCY_THRESHOLD,
+)
+
+
+@dataclass
+class Coverage:
+    """Per-sub-question coverage scores and the verdict derived from them."""
+    scores: dict[str, float] = field(default_factory=dict)
+    evaluator: str = "lexical"
+    error: str | None = None  # why the requested evaluator fell back to lexical
+
+    @property
+    def gaps(self) -> list[str]:
+        return [q for q, score in self.scores.items() if score < SUFFICIENCY_QUESTION_SCORE]
+
+    @property
+    def ratio(self) -> float:
+        """Share of sub-questions covered (0 with no questions)."""
+        if not self.scores:
+            return 0.0
+        return 1 - len(self.gaps) / len(self.scores)
+
+    @property
+    def sufficient(self) -> bool:
+        return self.ratio >= SUFFICIENCY_THRESHOLD
+
+    def describe(self) -> str:
+        covered = len(self.scores) - len(self.gaps)
+        return f"{covered}/{len(self.scores)} sub-questions covered ({self.ratio:.0%}, {self.evaluator})"
+
+
+def _contents(sources: list[dict]) -> list[str]:
+    return [s.get("content", s.get("snippet", "")) for s in sources]
+
+
+def lexical_coverage(topic: str, questions: list[str], sources: list[dict]) -> Coverage:
+    """
+    Score each question by the best IDF-weighted share of its terms that
+    appear together in a single source passage. Terms no source mentions
+    get the highest weight, so a question missing its key term scores low.
+    """
+    # numpy loads on first use, not at startup
+    import numpy as np
+
+    from src.retrieval import SourceRetriever, tokenize
+
+    retriever = SourceRetriever(_contents(sources), RETRIEVAL_CHUNK_WORDS)
+    index = retriever.index
+    unseen_idf = float(np.log(1.0 + (index.n_docs + 0.5) / 0.5))
+    chunk_terms: dict[int, set[str]] = {}
+
+    scores = {}
+    for question in questions:
+        terms = set(tokenize(question))
+        if not terms:
+            scores[question] = 1.0
+            continue
+        weight = {
+            t: float(index.idf[index.vocabulary[t]]) if t in index.vocabulary else unseen_idf
+            for t in terms
+        }
+        total = sum(weight.values())
+        best = 0.0
+        for i, _ in index.search(question, 5):
+            if i not in chunk_terms:
+                chunk_terms[i] = set(tokenize(retriever.chunks[i].text))
+            best = max(best, sum(weight[t] for t in terms & chunk_terms[i]) / total)
+        scores[question] = round(best, 3)
+    return Coverage(scores=scores, evaluator="lexical")
+
+
+SUFFICIENCY_JUDGE_PROMPT = """\
+You are a research editor deciding whether enough material has been \
+collected. For each numbered sub-question, rate how well the sources \
+below answer it, from 0.0 (not addressed) to 1.0 (answered with \
+specific, well-supported detail).
+
+Output ONLY valid JSON with one score per sub-question, in order:
+{"scores": [0.0, ...]}
+"""
+
+
+def llm_coverage(topic: str, questions: list[str], sources: list[dict]) -> Coverage:
+    """Ask a judge model to score each question against the packed sources."""
+    from langchain_core.messages import HumanMessage, SystemMessage
+
+    from src.config import get_llm
+    from src.context import pack, relevance
+
+    contents = _contents(sources)
+    packed = pack(
+        contents,
+        SUFFICIENCY_JUDGE_TOKEN_BUDGET,
+        [0.5 + relevance(c, " ".join([topic, *questions])) for c in contents],
+    )
+    source_text = "".join(
+        f"\n### Source {i} — {s.get('title', 'Untitled')}\n{text}\n"
+        for i, (s, text) in enumerate(zip(sources, packed.texts), 1)
+        if text
+    )
+    question_text = "".join(f"{i}. {q}\n" for i, q in enumerate(questions, 1))
+
+    llm = get_llm(temperature=0, streaming=False, node="sufficiency")
+    try:
+        response = llm.invoke([
+            SystemMessage(content=SUFFICIENCY_JUDGE_PROMPT),
+            HumanMessage(content=(
+                f"**Research Topic:** {topic}\n\n"
+                f"## Sub-Questions\n{question_text}\n"
+                f"## Sources\n{source_text}"
+            )),
+        ])
+    except Exception as e:
+        # A failed judge must not fail the run after the research is paid for
+        coverage = lexical_coverage(topic, questions, sources)
+        coverage.error = f"Sufficiency judge failed, used lexical coverage: {e}"
+        return coverage
+
+    try:
+        content = response.content.strip()
+        if content.startswith("```"):
+            content = content.split("\n", 1)[1]
+            content = content.rsplit("```", 1)[0]
+        raw = json.loads(content)["scores"]
+        if len(raw) != len(questions):
+            raise ValueError("wrong number of scores")
+        scores = {q: min(1.0, max(0.0, float(s))) for q, s in zip(questions, raw)}
+    except (json.JSONDecodeError, IndexError, KeyError, TypeError, ValueError) as e:
+        coverage = lexical_coverage(topic, questions, sources)
+        coverage.error = f"Sufficiency judge answer unusable, used lexical coverage: {e}"
+        return coverage
+    return Coverage(scores=scores, evaluator="llm")
+
+
+EVALUATORS: dict[str, Callable[[str, list[str], list[dict]], Coverage]] = {
+    "lexical": lexical_coverage,
+    "llm": llm_coverage,
+}
+
+
+def resolve_evaluator(name: str = SUFFICIENCY_EVALUATOR) -> str:
+    """Validate an evaluator name; called when the graph is built so typos fail fast."""
+    if name not in EVALUATORS:
+        raise ValueError(f"Unknown SUFFICIENCY_EVALUATOR {name!r}; choose from {sorted(EVALUATORS)}")
+    return name
+
+
+def evaluate_coverage(
+    topic: str,
+    questions: list[str],
+    sources: list[dict],
+    evaluator: str = SUFFICIENCY_EVALUATOR,
+) -> Coverage:
+    """Score how well `sources` cover `questions` with the named evaluator."""
+    resolve_evaluator(evaluator)
+    if not questions:
+        questions = [topic]
+    if not sources:
+        return Coverage(scores=dict.fromkeys(questions, 0.0), evaluator=evaluator)
+    return EVALUATORS[evaluator](topic, questions, sources)
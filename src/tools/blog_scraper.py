@@ -4,34 +4,77 @@ Blog / URL scraper tool — extracts main content from web pages.
 
 from __future__ import annotations
 
-import requests
-from bs4 import BeautifulSoup
+import re
+from typing import TYPE_CHECKING
+
 from langchain_core.tools import tool
 
-from src.config import MAX_SCRAPE_LENGTH
+from src.config import MAX_SCRAPE_LENGTH, SCRAPE_ALLOWED_TYPES, SCRAPE_MAX_BYTES
+from src.governor import get_governor
+from src.metrics import annotate, span
+from src.tools.extractors import extract_page
+from src.tools.page_cache import get_page_cache
 
+if TYPE_CHECKING:
+    import requests
+
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([\w-]+)""", re.IGNORECASE)
+
+
+def _read_capped(response: requests.Response, max_bytes: int) -> bytes:
+    """Read at most `max_bytes` of the (decompressed) body, then stop."""
+    chunks = []
+    size = 0
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            break
+    return b"".join(chunks)[:max_bytes]
+
+
+def _decode(body: bytes, response: requests.Response) -> str:
+    """Decode using the header charset, then <meta charset>, then UTF-8."""
+    encoding = None
+    if "charset=" in response.headers.get("Content-Type", "").lower():
+        encoding = response.encoding
+    if not encoding:
+        match = _META_CHARSET.search(body[:4096])
+        encoding = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
 
-def _extract_main_content(soup: BeautifulSoup) -> str:
-    """
-    Heuristically extract the main text content from a parsed page.
-    Tries <article>, <main>, then falls back to <body>.
-    """
-    # Remove noise elements
-    for tag in soup.find_all(["script", "style", "nav", "footer", "header", "aside"]):
-        tag.decompose()
 
-    # Try semantic containers first
-    for selector in ["article", "main", '[role="main"]', ".post-content", ".entry-content"]:
-        container = soup.select_one(selector)
-        if container:
-            return container.get_text(separator="\n", strip=True)
+def _fetch(url: str, headers: dict) -> requests.Response:
+    """GET `url` (streamed); 429s raise so the governor can back off and retry."""
+    # requests/urllib3 load on the first fetch, not at startup
+    from src.tools.http_client import get_session
 
-    # Fallback to body
-    body = soup.find("body")
-    if body:
-        return body.get_text(separator="\n", strip=True)
+    response = get_session().get(url, headers=headers, timeout=15, stream=True)
+    if response.status_code == 429:
+        response.close()
+        response.raise_for_status()
+    return response
+
+
+def _build_result(url: str, title: str, content: str, cache_status: str | None) -> dict:
+    # Truncate to avoid blowing up context windows
+    if len(content) > MAX_SCRAPE_LENGTH:
+        content = content[:MAX_SCRAPE_LENGTH] + "\n\n[... content truncated ...]"
 
-    return soup.get_text(separator="\n", strip=True)
+    result = {
+        "url": url,
+        "title": title,
+        "content": content,
+        "word_count": len(content.split()),
+        "source_type": "blog",
+    }
+    if cache_status:
+        result["cache_status"] = cache_status  # "hit" | "miss" | "revalidated"
+    return result
 
 
 @tool
@@ -43,39 +86,67 @@ def scrape_blog(url: str) -> dict:
     Args:
         url: The full URL of the blog post or web page to scrape.
     """
-    try:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            )
-        }
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-
-        soup = BeautifulSoup(response.text, "html.parser")
-
-        title = ""
-        title_tag = soup.find("title")
-        if title_tag:
-            title = title_tag.get_text(strip=True)
+    with span("tool", "scrape_blog", url=url, bytes=0):
+        result = _scrape(url)
+        annotate(cache=result.get("cache_status", "none"), words=result.get("word_count", 0))
+        if "error" in result:
+            annotate(error=result["error"])
+        return result
 
-        content = _extract_main_content(soup)
 
-        # Truncate to avoid blowing up context windows
-        if len(content) > MAX_SCRAPE_LENGTH:
-            content = content[:MAX_SCRAPE_LENGTH] + "\n\n[... content truncated ...]"
+def _scrape(url: str) -> dict:
+    import requests
 
-        word_count = len(content.split())
+    try:
+        cache = get_page_cache()
+        cached = cache.lookup(url) if cache else None
+        if cached and cached["fresh"]:
+            return _build_result(url, cached["title"], cached["content"], "hit")
+
+        # Conditional request: a 304 skips both the download and the parse
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+
+        # Stream the body so nothing past SCRAPE_MAX_BYTES is ever read
+        response = get_governor("scrape").call(lambda: _fetch(url, headers))
+        with response:
+            annotate(status=response.status_code)
+            if response.status_code == 304 and cached:
+                cache.refresh(url)
+                return _build_result(url, cached["title"], cached["content"], "revalidated")
+            response.raise_for_status()
+
+            # Gate on Content-Type before downloading (PDFs, video, ...)
+            content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+            if content_type and content_type not in SCRAPE_ALLOWED_TYPES:
+                return {
+                    "url": url,
+                    "error": f"Unsupported content type: {content_type}",
+                    "source_type": "blog",
+                }
+
+            body = _read_capped(response, SCRAPE_MAX_BYTES)
+            annotate(bytes=len(body))
+            html = _decode(body, response)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        # One char past the limit is enough for _build_result to mark truncation
+        title, content = extract_page(html, max_chars=MAX_SCRAPE_LENGTH + 1)
+
+        if cache:
+            cache.store(
+                url,
+                title,
+                content,
+                etag=etag,
+                last_modified=last_modified,
+            )
 
-        return {
-            "url": url,
-            "title": title,
-            "content": content,
-            "word_count": word_count,
-            "source_type": "blog",
-        }
+        return _build_result(url, title, content, "miss" if cache else None)
 
     except requests.exceptions.Timeout:
         return {"url": url, "error": "Request timed out", "source_type": "blog"}
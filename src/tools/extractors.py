@@ -0,0 +1,171 @@
+"""
+HTML → (title, main text) extraction backends for the blog scraper.
+
+Backends, fastest first:
+    selectolax   — lexbor C parser (optional `selectolax` package)
+    lxml         — BeautifulSoup over the C-backed lxml parser
+    html.parser  — BeautifulSoup over the pure-Python stdlib parser
+
+All of them apply the same heuristics: drop navigation/boilerplate tags,
+then take the first semantic container (<article>, <main>, ...) or
+fall back to <body>. Text collection stops once `max_chars` characters
+have been captured.
+"""
+
+from __future__ import annotations
+
+from typing import Callable
+
+from src.config import HTML_EXTRACTOR
+
+NOISE_TAGS = ["script", "style", "nav", "footer", "header", "aside"]
+CONTENT_SELECTORS = ["article", "main", '[role="main"]', ".post-content", ".entry-content"]
+
+
+# ── BeautifulSoup backends ───────────────────────────────────────────
+def _get_text(node, max_chars: int | None) -> str:
+    """`node.get_text("\n", strip=True)`, but stops after `max_chars`."""
+    if max_chars is None:
+        return node.get_text(separator="\n", strip=True)
+    parts = []
+    size = 0
+    for string in node.stripped_strings:
+        parts.append(string)
+        size += len(string) + 1
+        if size > max_chars:
+            break
+    return "\n".join(parts)[:max_chars]
+
+
+def _extract_main_content(soup, max_chars: int | None = None) -> str:
+    """
+    Heuristically extract the main text content from a parsed page.
+    Tries <article>, <main>, then falls back to <body>.
+    """
+    # Remove noise elements
+    for tag in soup.find_all(NOISE_TAGS):
+        tag.decompose()
+
+    # Try semantic containers first
+    for selector in CONTENT_SELECTORS:
+        container = soup.select_one(selector)
+        if container:
+            return _get_text(container, max_chars)
+
+    # Fallback to body
+    body = soup.find("body")
+    if body:
+        return _get_text(body, max_chars)
+
+    return _get_text(soup, max_chars)
+
+
+def _extract_bs4(html: str, parser: str, max_chars: int | None) -> tuple[str, str]:
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, parser)
+
+    title = ""
+    title_tag = soup.find("title")
+    if title_tag:
+        title = title_tag.get_text(strip=True)
+
+    return title, _extract_main_content(soup, max_chars)
+
+
+def extract_html_parser(html: str, max_chars: int | None = None) -> tuple[str, str]:
+    return _extract_bs4(html, "html.parser", max_chars)
+
+
+def extract_lxml(html: str, max_chars: int | None = None) -> tuple[str, str]:
+    return _extract_bs4(html, "lxml", max_chars)
+
+
+# ── selectolax backend ───────────────────────────────────────────────
+def extract_selectolax(html: str, max_chars: int | None = None) -> tuple[str, str]:
+    from selectolax.lexbor import LexborHTMLParser
+
+    tree = LexborHTMLParser(html)
+
+    title = ""
+    title_node = tree.css_first("title")
+    if title_node:
+        title = title_node.text(strip=True)
+
+    tree.strip_tags(NOISE_TAGS)
+
+    container = None
+    for selector in CONTENT_SELECTORS:
+        container = tree.css_first(selector)
+        if container:
+            break
+    container = container or tree.body or tree.root
+    if container is None:
+        return title, ""
+
+    if max_chars is None:
+        text = container.text(separator="\n", strip=True)
+        # lexbor keeps empty strings between block elements; match bs4's output
+        return title, "\n".join(line for line in text.split("\n") if line)
+
+    # Walk text nodes lazily so huge pages stop as soon as the limit is hit
+    parts = []
+    size = 0
+    for node in container.traverse(include_text=True):
+        if node.tag != "-text":
+            continue
+        string = node.text_content.strip()
+        if string:
+            parts.append(string)
+            size += len(string) + 1
+            if size > max_chars:
+                break
+    return title, "\n".join(parts)[:max_chars]
+
+
+EXTRACTORS: dict[str, Callable[..., tuple[str, str]]] = {
+    "selectolax": extract_selectolax,
+    "lxml": extract_lxml,
+    "html.parser": extract_html_parser,
+}
+
+
+def _available(name: str) -> bool:
+    module = {"selectolax": "selectolax.lexbor", "lxml": "lxml", "html.parser": "bs4"}[name]
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def resolve_extractor(name: str = HTML_EXTRACTOR) -> str:
+    """Resolve "auto" to the fastest installed backend."""
+    if name != "auto":
+        if name not in EXTRACTORS:
+            raise ValueError(f"Unknown HTML_EXTRACTOR {name!r}; choose from {sorted(EXTRACTORS)} or 'auto'")
+        return name
+    for candidate in ("selectolax", "lxml"):
+        if _available(candidate):
+            return candidate
+    return "html.parser"
+
+
+_backend: str | None = None
+
+
+def extract_page(html: str, max_chars: int | None = None) -> tuple[str, str]:
+    """
+    Return `(title, main_text)` for an HTML document using the configured
+    backend, falling back to the pure-Python parser if a fast one fails.
+    """
+    global _backend
+    if _backend is None:
+        _backend = resolve_extractor()
+
+    if _backend != "html.parser":
+        try:
+            return EXTRACTORS[_backend](html, max_chars)
+        except Exception:
+            pass
+    return extract_html_parser(html, max_chars)
@@ -0,0 +1,81 @@
+"""
+Persistent cache of scraped pages, keyed by canonical URL.
+
+Stores the extracted title and content together with the `ETag` /
+`Last-Modified` validators so stale entries can be revalidated with a
+conditional request instead of being downloaded and parsed again.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from src.cache import SqliteCache
+from src.config import (
+    PAGE_CACHE_ENABLED,
+    PAGE_CACHE_MAX_BYTES,
+    PAGE_CACHE_PATH,
+    PAGE_CACHE_TTL,
+)
+from src.urls import canonical_url
+
+
+class PageCache:
+    """Scraped-page store on top of `SqliteCache`."""
+
+    def __init__(self, path: str, max_bytes: int, ttl: float):
+        self.ttl = ttl
+        self._store = SqliteCache(path, table="pages", max_bytes=max_bytes)
+
+    def lookup(self, url: str) -> dict | None:
+        """
+        Return the cached entry for `url` or None.
+
+        The entry carries `fresh=True` when it is younger than the TTL and
+        can be served without contacting the origin at all.
+        """
+        found = self._store.get(canonical_url(url))
+        if found is None:
+            return None
+        value, created_at = found
+        entry = json.loads(value)
+        entry["fresh"] = (time.time() - created_at) < self.ttl
+        return entry
+
+    def store(
+        self,
+        url: str,
+        title: str,
+        content: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        entry = {
+            "title": title,
+            "content": content,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        self._store.set(canonical_url(url), json.dumps(entry).encode("utf-8"))
+
+    def refresh(self, url: str) -> None:
+        """Record a successful revalidation (HTTP 304)."""
+        self._store.touch(canonical_url(url))
+
+
+_page_cache: PageCache | None = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache | None:
+    """Return the process-wide page cache, or None when disabled."""
+    global _page_cache
+    if not PAGE_CACHE_ENABLED:
+        return None
+    if _page_cache is None:
+        with _page_cache_lock:
+            if _page_cache is None:
+                _page_cache = PageCache(PAGE_CACHE_PATH, PAGE_CACHE_MAX_BYTES, PAGE_CACHE_TTL)
+    return _page_cache
@@ -0,0 +1,77 @@
+"""
+TTL cache for web search results, shared across iterations, topics and
+(with the SQLite backend) runs.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+
+from src.cache import MemoryCache, SqliteCache
+from src.config import (
+    SEARCH_CACHE_BACKEND,
+    SEARCH_CACHE_MAX_BYTES,
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_PATH,
+    SEARCH_CACHE_TTL,
+)
+
+def normalize_query(query: str) -> str:
+    """
+    Reduce a query to a canonical form so trivial variants share an entry:
+    only case and whitespace are folded. Punctuation and word order are
+    kept, since search operators (`-term`, `"exact phrase"`, `site:`)
+    change what the backend returns.
+    """
+    return " ".join(query.lower().split())
+
+
+class SearchCache:
+    """Search results keyed by (backend, normalized query, max_results)."""
+
+    def __init__(self, store: MemoryCache | SqliteCache, ttl: float):
+        self.ttl = ttl
+        self._store = store
+
+    @staticmethod
+    def _key(backend: str, query: str, max_results: int) -> str:
+        return f"{backend}|{normalize_query(query)}|{max_results}"
+
+    def get(self, backend: str, query: str, max_results: int) -> list[dict] | None:
+        key = self._key(backend, query, max_results)
+        found = self._store.get(key)
+        if found is None:
+            return None
+        value, created_at = found
+        if time.time() - created_at >= self.ttl:
+            self._store.delete(key)
+            return None
+        return json.loads(value)
+
+    def set(self, backend: str, query: str, max_results: int, results: list[dict]) -> None:
+        self._store.set(
+            self._key(backend, query, max_results),
+            json.dumps(results).encode("utf-8"),
+        )
+
+
+_search_cache: SearchCache | None = None
+_search_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchCache | None:
+    """Return the process-wide search cache, or None when disabled."""
+    global _search_cache
+    if SEARCH_CACHE_BACKEND in ("none", "off", ""):
+        return None
+    if _search_cache is None:
+        with _search_cache_lock:
+            if _search_cache is None:
+                if SEARCH_CACHE_BACKEND == "sqlite":
+                    store = SqliteCache(SEARCH_CACHE_PATH, table="search", max_bytes=SEARCH_CACHE_MAX_BYTES)
+                else:
+                    store = MemoryCache(max_entries=SEARCH_CACHE_MAX_ENTRIES)
+                _search_cache = SearchCache(store, SEARCH_CACHE_TTL)
+    return _search_cache
@@ -7,7 +7,27 @@ from __future__ import annotations
 from langchain_core.tools import tool
 from langchain_core.messages import SystemMessage, HumanMessage
 
-from src.config import get_llm
+from src.config import SUMMARIZER_TOKEN_BUDGET, SUMMARY_MAX_CONCURRENCY, get_llm
+from src.context import trim_to_tokens
+
+
+SUMMARIZER_SYSTEM_PROMPT = (
+    "You are a precise research summarizer. Extract the key information "
+    "from the provided text that is most relevant to the given research focus. "
+    "Be concise but thorough. Include specific facts, data points, and insights. "
+    "Preserve any important quotes or statistics."
+)
+
+
+def _build_messages(text: str, focus: str) -> list:
+    return [
+        SystemMessage(content=SUMMARIZER_SYSTEM_PROMPT),
+        HumanMessage(content=(
+            f"**Research Focus:** {focus}\n\n"
+            f"**Text to Summarize:**\n{trim_to_tokens(text, SUMMARIZER_TOKEN_BUDGET)}\n\n"
+            "Provide a focused summary (200-400 words):"
+        )),
+    ]
 
 
 @tool
@@ -22,24 +42,39 @@ def summarize_content(text: str, focus: str) -> str:
     if not text or not text.strip():
         return "No content to summarize."
 
-    llm = get_llm(temperature=0.1, streaming=False)
-
-    messages = [
-        SystemMessage(content=(
-            "You are a precise research summarizer. Extract the key information "
-            "from the provided text that is most relevant to the given research focus. "
-            "Be concise but thorough. Include specific facts, data points, and insights. "
-            "Preserve any important quotes or statistics."
-        )),
-        HumanMessage(content=(
-            f"**Research Focus:** {focus}\n\n"
-            f"**Text to Summarize:**\n{text[:6000]}\n\n"
-            "Provide a focused summary (200-400 words):"
-        )),
-    ]
+    llm = get_llm(temperature=0.1, streaming=False, node="summarizer")
 
     try:
-        response = llm.invoke(messages)
+        response = llm.invoke(_build_messages(text, focus))
         return response.content
     except Exception as e:
         return f"Summarization failed: {e}"
+
+
+def summarize_batch(
+    items: list[tuple[str, str]],
+    max_concurrency: int | None = None,
+) -> list[str | Exception]:
+    """
+    Summarize many `(text, focus)` pairs concurrently.
+
+    Returns one result per item, in input order: the summary, or the
+    exception for an item that could not be summarized (including empty
+    text), so one bad call never sinks the batch and a failure can't be
+    mistaken for summary text.
+    """
+    summaries: list[str | Exception] = [ValueError("no content to summarize")] * len(items)
+    pending = [i for i, (text, _) in enumerate(items) if text and text.strip()]
+    if not pending:
+        return summaries
+
+    llm = get_llm(temperature=0.1, streaming=False, node="summarizer")
+    responses = llm.batch(
+        [_build_messages(*items[i]) for i in pending],
+        config={"max_concurrency": max_concurrency or SUMMARY_MAX_CONCURRENCY},
+        return_exceptions=True,
+    )
+
+    for i, response in zip(pending, responses):
+        summaries[i] = response if isinstance(response, Exception) else response.content
+    return summaries
@@ -7,6 +7,10 @@ from __future__ import annotations
 import os
 from langchain_core.tools import tool
 
+from src.governor import get_governor
+from src.metrics import annotate, span
+from src.tools.search_cache import get_search_cache
+
 
 def _search_tavily(query: str, max_results: int) -> list[dict]:
     """Search using Tavily API."""
@@ -52,10 +56,26 @@ def web_search(query: str, max_results: int = 5) -> list[dict]:
         query: The search query string.
         max_results: Maximum number of results to return (default 5).
     """
-    try:
-        if os.getenv("TAVILY_API_KEY"):
-            return _search_tavily(query, max_results)
-        else:
-            return _search_duckduckgo(query, max_results)
-    except Exception as e:
-        return [{"error": str(e), "source_type": "web_search"}]
+    backend = "tavily" if os.getenv("TAVILY_API_KEY") else "duckduckgo"
+
+    with span("tool", "web_search", query=query, backend=backend):
+        cache = get_search_cache()
+        if cache:
+            cached = cache.get(backend, query, max_results)
+            if cached is not None:
+                annotate(cache="hit", results=len(cached))
+                return cached
+
+        search = _search_tavily if backend == "tavily" else _search_duckduckgo
+        try:
+            # Throttling (429 / RatelimitException) is retried with backoff
+            results = get_governor("search").call(lambda: search(query, max_results))
+        except Exception as e:
+            # Errors are never cached so the next call retries the backend
+            annotate(error=str(e))
+            return [{"error": str(e), "source_type": "web_search"}]
+
+        annotate(cache="miss" if cache else "none", results=len(results))
+        if cache and results:
+            cache.set(backend, query, max_results, results)
+        return results
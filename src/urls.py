@@ -0,0 +1,58 @@
+"""
+URL helpers — canonical forms used as cache and deduplication keys.
+"""
+
+from __future__ import annotations
+
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Query parameters that only track the click and never change the page
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "ref", "ref_src", "ref_url", "spm", "_hsenc", "_hsmi", "_ga", "_gl",
+}
+_TRACKING_PREFIXES = ("utm_", "pk_", "mtm_")
+
+
+def _is_tracking_param(name: str) -> bool:
+    name = name.lower()
+    return name in _TRACKING_PARAMS or name.startswith(_TRACKING_PREFIXES)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so trivially different spellings map to the same key.
+
+    http/https, a leading `www.`, default ports, fragments, trailing
+    slashes, tracking parameters (`utm_*`, `fbclid`, ...) and query
+    parameter order are all ignored. The result is a key, not necessarily
+    the URL to fetch.
+    """
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if port and port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    if scheme == "http":
+        scheme = "https"
+
+    path = parts.path.rstrip("/") or "/"
+    query = urlencode(sorted(
+        (k, v)
+        for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _is_tracking_param(k)
+    ))
+
+    return urlunsplit((scheme, host, path, query, ""))
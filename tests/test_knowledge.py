@@ -0,0 +1,88 @@
+import pytest
+
+import src.knowledge as knowledge
+from src.agents import researcher
+from src.knowledge import KnowledgeStore
+
+PAGE = " ".join(
+    f"Sentence {i} explains how vector databases index embeddings for retrieval." for i in range(60)
+)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = KnowledgeStore(str(tmp_path / "knowledge.db"))
+    monkeypatch.setattr(knowledge, "_knowledge_store", store)
+    monkeypatch.setattr(researcher, "KNOWLEDGE_ENABLED", True)
+    monkeypatch.setattr(researcher, "_search", lambda query: [])
+    monkeypatch.setattr(
+        researcher,
+        "_scrape",
+        lambda url: {"url": url, "title": "Vector databases", "content": PAGE, "source_type": "blog"},
+    )
+    return store
+
+
+def test_failed_summary_is_never_stored(store, monkeypatch):
+    monkeypatch.setattr(
+        researcher, "summarize_batch", lambda items: [RuntimeError("rate limited") for _ in items]
+    )
+    output = researcher.researcher_node({
+        "topic": "vector databases",
+        "research_plan": {"urls_to_scrape": ["https://blog.example.com/vectors"]},
+    })
+
+    assert any("Summarization failed" in e for e in output["errors"])
+    (source,) = output["sources"]
+    assert "rate limited" not in source["content"]
+    assert PAGE.startswith(source["content"].rstrip())
+
+    stored = store.get("https://blog.example.com/vectors")
+    assert stored is not None
+    assert stored["content"] == source["content"]
+    assert all("rate limited" not in doc["content"] for doc in store.search("vector databases"))
+
+
+def test_second_iteration_does_not_recall_the_runs_own_sources(store, monkeypatch):
+    searched = []
+    monkeypatch.setattr(researcher, "_search", lambda query: searched.append(query) or [])
+    monkeypatch.setattr(researcher, "summarize_batch", lambda items: [text[:500] for text, _ in items])
+    angles = ["hnsw graphs", "product quantization", "hybrid keyword ranking"]
+    urls = [f"https://blog.example.com/vectors-{i}" for i in range(3)]
+    pages = {
+        url: " ".join(
+            f"Part {j} on {angle}: vector databases index embeddings for retrieval {j * (i + 7)}."
+            for j in range(60)
+        )
+        for i, (url, angle) in enumerate(zip(urls, angles))
+    }
+    monkeypatch.setattr(
+        researcher,
+        "_scrape",
+        lambda url: {"url": url, "title": "Vector databases", "content": pages[url], "source_type": "blog"},
+    )
+
+    first = researcher.researcher_node({
+        "topic": "vector databases",
+        "research_plan": {"urls_to_scrape": urls},
+    })
+    assert len(first["sources"]) == 3
+
+    query = "vector databases embeddings retrieval"
+    second = researcher.researcher_node({
+        "topic": "vector databases",
+        "research_plan": {"search_queries": [query]},
+        "sources": first["sources"],
+        "scraped_urls": first["scraped_urls"],
+    })
+    assert searched == [query]
+    assert second["sources"] == []
+    assert not any("Knowledge store" in m for m in second["messages"])
+
+    # A new run has none of these sources, so the store answers the query
+    fresh = researcher.researcher_node({
+        "topic": "vector databases",
+        "research_plan": {"search_queries": [query]},
+    })
+    assert searched == [query]
+    assert len(fresh["sources"]) == 3
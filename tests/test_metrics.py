@@ -0,0 +1,26 @@
+from src.metrics import instrument_node
+
+
+def test_source_counts_follow_the_merge_reducer():
+    existing = [{"url": "https://a.com/x", "content": "short"}]
+
+    def researcher(state):
+        return {"sources": [
+            {"url": "https://a.com/x", "content": "upgraded, longer content"},  # re-emitted
+            {"url": "https://b.com/", "content": "b"},
+            {"url": "https://b.com/?utm_source=feed", "content": "b"},  # same canonical URL
+        ]}
+
+    output = instrument_node("researcher", researcher)({"sources": existing})
+    attributes = output["trace"][0]["attributes"]
+    assert attributes["new_sources"] == 1
+    assert attributes["total_sources"] == 2
+
+
+def test_nodes_without_sources_report_the_state_total():
+    output = instrument_node("analyzer", lambda state: {"analysis": "ok"})(
+        {"sources": [{"url": "https://a.com/"}]}
+    )
+    attributes = output["trace"][0]["attributes"]
+    assert "new_sources" not in attributes
+    assert attributes["total_sources"] == 1
@@ -0,0 +1,19 @@
+from src.cache import MemoryCache
+from src.tools.search_cache import SearchCache, normalize_query
+
+
+def test_normalize_folds_case_and_whitespace():
+    assert normalize_query("  Rust   ASYNC ") == normalize_query("rust async")
+
+
+def test_operator_queries_do_not_collide():
+    assert normalize_query("a -b") != normalize_query("a b")
+    assert normalize_query('"rust async"') != normalize_query("rust async")
+    assert normalize_query("rust -async") != normalize_query("rust async")
+
+
+def test_cache_keeps_operator_queries_apart():
+    cache = SearchCache(MemoryCache(), ttl=60)
+    cache.set("ddg", "a b", 5, [{"url": "https://example.com/plain"}])
+    assert cache.get("ddg", "a -b", 5) is None
+    assert cache.get("ddg", "A  b", 5) == [{"url": "https://example.com/plain"}]